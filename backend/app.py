@@ -21,4 +21,4 @@ if __name__ == "__main__":
         app.run(host=host, port=port, debug=debug)
     else:
         print(f"Starting production server at http://{host}:{port}")
-        serve(app, host=host, port=port)
+        serve(app, host=host, port=port, threads=config.SERVER_THREADS)
@@ -6,6 +6,17 @@ from app.routes.admin_routes import admin_bp
 from app.routes.user_routes import user_bp
 from app.routes.auth_routes import auth_bp
 from app.database.database import db
+from app.database.migrations import upgrade
+from app.database.sqlite_profile import apply_sqlite_profile
+from app.database.slow_query_log import slow_query_log
+from app.services.audit_writer import audit_writer
+from app.utils.password_hasher import password_hasher
+from app.utils.login_throttle import login_throttle
+from app.utils.token_epochs import token_epochs
+from app.utils.logging_config import logger
+from app.utils.json_provider import make_json_provider
+from app.utils.metrics import request_metrics
+from app.cli import register_commands
 from config import DevelopmentConfig, ProductionConfig
 
 
@@ -45,12 +56,32 @@ def create_app(config_class=DevelopmentConfig):
     # ...
 
     app.config.from_object(config_class)
+    app.json = make_json_provider(app)
 
     flask_logger = logging.getLogger("werkzeug")
     flask_logger.setLevel(logging.WARNING)
 
     db.init_app(app)
 
+    with app.app_context():
+        apply_sqlite_profile(db.engine, app.config.get("SQLITE_PRAGMAS"))
+        request_metrics.init_app(app, db.engine)
+        slow_query_log.init_app(app, db.engine)
+
+    if app.config.get("AUTO_MIGRATE", True):
+        try:
+            with app.app_context():
+                upgrade(db.engine)
+        except Exception as e:
+            logger.error(f"Error applying database migrations: {str(e)}")
+
+    audit_writer.init_app(app)
+    password_hasher.init_app(app)
+    login_throttle.init_app(app)
+    token_epochs.init_app(app)
+
+    register_commands(app)
+
     # If Flask and React are deployed separately
     # CORS(app)
 
@@ -0,0 +1,159 @@
+import json
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.counter_service import CounterService
+from app.services.search_index import SearchIndex
+from app.services.import_service import IMPORT_FORMATS, ImportService
+from app.services.password_migration import PasswordMigration
+from app.services.purge_service import PurgeService
+from app.services.retention_service import RetentionService
+from app.database.database import db
+from app.database.migrations import MIGRATIONS, applied_versions, upgrade
+from app.database.query_plans import check_query_plans
+
+
+counters_cli = AppGroup("counters", help="Maintain the dashboard counters.")
+
+
+@counters_cli.command("reconcile")
+def reconcile_counters():
+    """Rebuild the global and per-user counters from the source tables."""
+    if not CounterService.reconcile():
+        raise click.ClickException("Reconciling counters failed, see app.log.")
+
+    click.echo("Counters reconciled.")
+
+
+search_cli = AppGroup("search", help="Maintain the full-text search index.")
+
+
+@search_cli.command("rebuild")
+def rebuild_search_index():
+    """Reindex users, cars and services."""
+    if not SearchIndex.reindex():
+        raise click.ClickException("Rebuilding the search index failed, see app.log.")
+
+    click.echo("Search index rebuilt.")
+
+
+services_cli = AppGroup("services", help="Bulk operations on service records.")
+
+
+@services_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "format_name", type=click.Choice(IMPORT_FORMATS), default=None)
+@click.option("--user-id", type=int, default=None, help="Only accept cars owned by this user.")
+def import_services(path, format_name, user_id):
+    """Stream service records from a CSV or NDJSON file into the database."""
+    if format_name is None:
+        format_name = "csv" if path.lower().endswith(".csv") else "ndjson"
+
+    with open(path, encoding="utf-8", errors="surrogateescape", newline="") as text_stream:
+        summary = ImportService.import_services(
+            text_stream,
+            format_name,
+            owner_id=user_id,
+            batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+            max_errors=current_app.config["IMPORT_MAX_ERRORS"],
+        )
+
+    click.echo(json.dumps(summary, indent=2))
+
+
+users_cli = AppGroup("users", help="Maintenance tasks for user accounts.")
+
+
+@users_cli.command("migrate-passwords")
+@click.option("--chunk-size", type=int, default=500, show_default=True)
+@click.option("--processes", type=int, default=None, help="Defaults to the CPU count.")
+def migrate_passwords(chunk_size, processes):
+    """Hash every remaining plaintext password in place."""
+    summary = PasswordMigration.migrate_plaintext(
+        current_app.config["BCRYPT_ROUNDS"], chunk_size=chunk_size, processes=processes
+    )
+
+    if summary is None:
+        raise click.ClickException("Migrating passwords failed, see app.log.")
+
+    click.echo(json.dumps(summary, indent=2))
+
+    if summary["remaining"] == 0:
+        click.echo("No plaintext passwords left; PLAINTEXT_PASSWORD_CHECK can be disabled.")
+
+
+@users_cli.command("purge")
+@click.argument("user_id", type=int)
+@click.option("--chunk-size", type=int, default=None, help="Defaults to PURGE_CHUNK_SIZE.")
+def purge_user(user_id, chunk_size):
+    """Delete a user and all of their rows in chunked transactions."""
+    PurgeService.purge_user(user_id, chunk_size or current_app.config["PURGE_CHUNK_SIZE"])
+    click.echo(f"User {user_id} purged.")
+
+
+logs_cli = AppGroup("logs", help="Maintain the login logs.")
+
+
+@logs_cli.command("prune")
+@click.option("--days", type=int, default=None, help="Defaults to LOGIN_LOG_RETENTION_DAYS.")
+@click.option("--chunk-size", type=int, default=None, help="Defaults to LOGIN_LOG_PRUNE_CHUNK_SIZE.")
+def prune_logs(days, chunk_size):
+    """Roll login logs older than the retention window into daily totals and delete them."""
+    days = days if days is not None else current_app.config["LOGIN_LOG_RETENTION_DAYS"]
+    cutoff = RetentionService.retention_cutoff(days)
+    pruned = RetentionService.prune_before(
+        cutoff, chunk_size or current_app.config["LOGIN_LOG_PRUNE_CHUNK_SIZE"]
+    )
+
+    if pruned is None:
+        raise click.ClickException("Pruning login logs failed, see app.log.")
+
+    click.echo(f"Pruned {pruned} login logs before {cutoff.date().isoformat()}.")
+
+
+db_cli = AppGroup("db", help="Manage the database schema.")
+
+
+@db_cli.command("upgrade")
+@click.option("--target", type=int, default=None, help="Stop after this version.")
+def upgrade_database(target):
+    """Apply pending schema migrations in order."""
+    upgraded = upgrade(db.engine, target=target)
+
+    if upgraded:
+        click.echo(f"Applied migrations: {', '.join(map(str, upgraded))}")
+    else:
+        click.echo("Database is up to date.")
+
+
+@db_cli.command("version")
+def database_version():
+    """Show applied and pending schema migrations."""
+    applied = applied_versions(db.engine)
+
+    for version, description, _ in MIGRATIONS:
+        status = "applied" if version in applied else "pending"
+        click.echo(f"{version:>4}  {status:<8} {description}")
+
+
+@db_cli.command("check-plans")
+def check_plans():
+    """Fail if a hot query is planned as a full table scan."""
+    failures = check_query_plans(db.engine)
+
+    for name, details in failures.items():
+        click.echo(f"{name}: {'; '.join(details)}")
+
+    if failures:
+        raise click.ClickException(f"{len(failures)} hot queries use a full table scan.")
+
+    click.echo("All hot queries use an index.")
+
+
+def register_commands(app):
+    app.cli.add_command(db_cli)
+    app.cli.add_command(counters_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(services_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(logs_cli)
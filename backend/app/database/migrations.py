@@ -0,0 +1,157 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, inspect, select, update
+from app.database.database import db
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.models.counter import Counter, UserCounter
+from app.models.login_daily import LoginDaily
+from app.models.visitor import VisitorCount, VisitorPeriod
+from app.models.token_epoch import TokenEpoch
+from app.services.counter_service import CounterService
+from app.services.search_index import TRIGRAM_AVAILABLE, SearchIndex
+from app.services.visitor_service import VisitorService
+from app.utils.etag import TableVersions
+from app.utils.logging_config import logger
+
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_core_tables(connection):
+    db.metadata.create_all(
+        connection,
+        tables=[User.__table__, Car.__table__, Service.__table__, LoginLogs.__table__],
+    )
+
+
+def _create_counter_tables(connection):
+    existing = set(inspect(connection).get_table_names())
+    if "counters" in existing and "user_counters" in existing:
+        return
+
+    Counter.__table__.create(connection, checkfirst=True)
+    UserCounter.__table__.create(connection, checkfirst=True)
+    CounterService.rebuild(connection)
+
+
+def _create_search_index(connection):
+    if connection.dialect.name != "sqlite":
+        return
+
+    SearchIndex.create_tables(connection)
+    if TRIGRAM_AVAILABLE:
+        SearchIndex.rebuild(connection)
+
+
+def _index_hot_lookup_columns(connection):
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_users_username ON users (username)",
+        "CREATE INDEX IF NOT EXISTS ix_cars_vin ON cars (vin)",
+        "CREATE INDEX IF NOT EXISTS ix_cars_user_id ON cars (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_services_car_id ON services (car_id)",
+        "CREATE INDEX IF NOT EXISTS ix_login_logs_user_open "
+        "ON login_logs (user_id, logout_time, login_time)",
+        "CREATE INDEX IF NOT EXISTS ix_login_logs_login_time "
+        "ON login_logs (login_time, log_id)",
+    ):
+        connection.exec_driver_sql(statement)
+
+
+def _create_login_rollups(connection):
+    LoginDaily.__table__.create(connection, checkfirst=True)
+
+
+def _create_visitor_periods(connection):
+    VisitorPeriod.__table__.create(connection, checkfirst=True)
+    VisitorCount.__table__.create(connection, checkfirst=True)
+    VisitorService.rebuild(connection)
+
+
+def _create_table_versions(connection):
+    if connection.dialect.name != "sqlite":
+        return
+
+    TableVersions.create_tables(connection)
+
+
+def _add_user_locked_flag(connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("users")}
+    if "locked" not in columns:
+        connection.exec_driver_sql(
+            "ALTER TABLE users ADD COLUMN locked BOOLEAN NOT NULL DEFAULT 0"
+        )
+
+    # Purges used to lock accounts by blanking the password.
+    connection.execute(update(User).where(User.password == "").values(locked=True))
+
+
+def _retokenize_search_index(connection):
+    if connection.dialect.name != "sqlite":
+        return
+
+    # Without the trigram tokenizer the index is dropped and search uses LIKE.
+    SearchIndex.drop_tables(connection)
+    SearchIndex.create_tables(connection)
+    if TRIGRAM_AVAILABLE:
+        SearchIndex.rebuild(connection)
+
+
+def _create_token_epochs(connection):
+    TokenEpoch.__table__.create(connection, checkfirst=True)
+
+
+MIGRATIONS = [
+    (1, "Create core tables", _create_core_tables),
+    (2, "Add dashboard counters", _create_counter_tables),
+    (3, "Add full-text search index", _create_search_index),
+    (4, "Index hot lookup columns", _index_hot_lookup_columns),
+    (5, "Add daily login rollups", _create_login_rollups),
+    (6, "Add unique visitors per period", _create_visitor_periods),
+    (7, "Track table versions for ETags", _create_table_versions),
+    (8, "Add explicit account lock", _add_user_locked_flag),
+    (9, "Use trigram tokenizer for search", _retokenize_search_index),
+    (10, "Store token revocation epochs", _create_token_epochs),
+]
+
+
+def applied_versions(engine):
+    schema_migrations.create(engine, checkfirst=True)
+
+    with engine.connect() as connection:
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def current_version(engine):
+    return max(applied_versions(engine), default=0)
+
+
+def upgrade(engine, target=None):
+    applied = applied_versions(engine)
+    upgraded = []
+
+    for version, description, migrate in MIGRATIONS:
+        if version in applied or (target is not None and version > target):
+            continue
+
+        with engine.begin() as connection:
+            migrate(connection)
+            connection.execute(
+                insert(schema_migrations).values(
+                    version=version,
+                    description=description,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+
+        logger.info(f"Applied migration {version}: {description}")
+        upgraded.append(version)
+
+    return upgraded
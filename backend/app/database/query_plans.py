@@ -0,0 +1,69 @@
+import re
+from datetime import datetime
+from sqlalchemy import select
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.utils.pagination import seek_condition
+
+
+_FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+( AS \w+)?$")
+
+
+def hot_queries():
+    return {
+        "user_by_username": select(User).where(User.username == "username"),
+        "car_by_vin": select(Car).where(Car.vin == "VIN"),
+        "cars_for_user": select(Car).where(Car.user_id == 1).order_by(Car.car_id),
+        "services_for_car": (
+            select(Service, Car.name)
+            .join(Car, Service.car_id == Car.car_id)
+            .where(Car.car_id == 1)
+            .order_by(Service.service_id)
+        ),
+        "open_login_for_user": (
+            select(LoginLogs)
+            .where(LoginLogs.user_id == 1, LoginLogs.logout_time.is_(None))
+            .order_by(LoginLogs.login_time.desc())
+            .limit(1)
+        ),
+        "login_logs_page": (
+            select(LoginLogs)
+            .order_by(LoginLogs.login_time, LoginLogs.log_id)
+            .limit(11)
+        ),
+        "login_logs_after_cursor": (
+            select(LoginLogs)
+            .where(
+                seek_condition(
+                    [LoginLogs.login_time, LoginLogs.log_id], [datetime(2000, 1, 1), 1]
+                )
+            )
+            .order_by(LoginLogs.login_time, LoginLogs.log_id)
+            .limit(11)
+        ),
+    }
+
+
+def explain(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters)
+    return [row[-1] for row in rows]
+
+
+def is_full_scan(details):
+    return any(_FULL_SCAN.match(detail) for detail in details)
+
+
+def check_query_plans(engine):
+    failures = {}
+
+    with engine.connect() as connection:
+        for name, statement in hot_queries().items():
+            details = explain(connection, statement)
+            if is_full_scan(details):
+                failures[name] = details
+
+    return failures
@@ -0,0 +1,137 @@
+import datetime
+import decimal
+import logging
+import os
+import threading
+import time
+import weakref
+from logging.handlers import RotatingFileHandler
+from flask import has_request_context, request
+from sqlalchemy import event
+from app.utils.logging_config import logger
+from app.utils.metrics import BACKGROUND, UNMATCHED
+
+
+_EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+_PLAIN_VALUES = (bool, int, float, decimal.Decimal, datetime.date, datetime.datetime, type(None))
+
+slow_query_logger = logging.getLogger("slow_queries")
+slow_query_logger.propagate = False
+
+
+class SlowQueryLog:
+    def __init__(self):
+        self.threshold = None
+        self.explain = True
+        self.logged = 0
+        self._engines = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, engine):
+        threshold_ms = app.config.get("SLOW_QUERY_THRESHOLD_MS", 0)
+        self.threshold = threshold_ms / 1000 if threshold_ms and threshold_ms > 0 else None
+        self.explain = app.config.get("SLOW_QUERY_EXPLAIN", True) and engine.dialect.name == "sqlite"
+
+        if self.threshold is None:
+            return
+
+        _attach_handler(
+            app.config.get("SLOW_QUERY_LOG_FILE", "slow_queries.log"),
+            app.config.get("SLOW_QUERY_LOG_MAX_BYTES", 5 * 1024 * 1024),
+            app.config.get("SLOW_QUERY_LOG_BACKUPS", 3),
+        )
+
+        if engine not in self._engines:
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+            self._engines.add(engine)
+
+    def stats(self):
+        return {
+            "threshold_ms": self.threshold * 1000 if self.threshold is not None else 0,
+            "logged": self.logged,
+        }
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None or self.threshold is None:
+            return
+
+        elapsed = time.perf_counter() - start
+        if elapsed < self.threshold:
+            return
+
+        try:
+            self._log(cursor, statement, parameters, executemany, elapsed)
+        except Exception as e:
+            logger.error(f"Error in slow query log: {str(e)}")
+
+    def _log(self, cursor, statement, parameters, executemany, elapsed):
+        if has_request_context():
+            rule = request.url_rule.rule if request.url_rule is not None else UNMATCHED
+            route = f"{request.method} {rule}"
+        else:
+            route = BACKGROUND
+
+        lines = [
+            f"{elapsed * 1000:.1f} ms {route}",
+            f"SQL: {' '.join(statement.split())}",
+            f"Parameters: {_redact(parameters, executemany)}",
+        ]
+
+        if self.explain and statement.lstrip().lower().startswith(_EXPLAINABLE):
+            plan_parameters = parameters[0] if executemany and parameters else parameters
+            lines.append("Plan:")
+            lines.extend(f"  {detail}" for detail in _explain(cursor, statement, plan_parameters))
+
+        slow_query_logger.warning("\n".join(lines))
+        with self._lock:
+            self.logged += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+def _attach_handler(filename, max_bytes, backups):
+    path = os.path.abspath(filename)
+    if any(getattr(handler, "baseFilename", None) == path for handler in slow_query_logger.handlers):
+        return
+
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.WARNING)
+
+
+def _explain(cursor, statement, parameters):
+    # A separate DBAPI cursor keeps the plan lookup out of the engine events.
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[-1] for row in plan_cursor.fetchall()]
+    finally:
+        plan_cursor.close()
+
+
+def _redact(parameters, executemany):
+    # Strings and bytes may hold passwords, emails or notes; only their size is logged.
+    if executemany:
+        if not parameters:
+            return "[]"
+        return f"{len(parameters)} parameter sets, first: {_redact(parameters[0], False)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_redact_value(value)}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(_redact_value(value) for value in parameters or ()) + ")"
+
+
+def _redact_value(value):
+    if isinstance(value, _PLAIN_VALUES):
+        return repr(value)
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,44 @@
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from app.database.database import db
+from app.utils.logging_config import logger
+
+
+BUSY_MESSAGES = ("database is locked", "database is busy")
+
+
+def apply_sqlite_profile(engine, pragmas):
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def is_busy_error(error):
+    return isinstance(error, OperationalError) and any(
+        message in str(error.orig).lower() for message in BUSY_MESSAGES
+    )
+
+
+def run_with_retry(work):
+    retries = current_app.config.get("SQLITE_BUSY_RETRIES", 5)
+    backoff = current_app.config.get("SQLITE_BUSY_BACKOFF", 0.05)
+
+    for attempt in range(retries + 1):
+        try:
+            return work()
+        except OperationalError as e:
+            if not is_busy_error(e) or attempt == retries:
+                raise
+
+            db.session.rollback()
+            delay = backoff * (2 ** attempt)
+            logger.warning(f"Database busy, retrying in {delay:.2f}s (attempt {attempt + 1})")
+            time.sleep(delay)
@@ -6,12 +6,15 @@ class Car(db.Model):
 
     car_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(
-        db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
+        db.Integer,
+        db.ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     name = db.Column(db.String(50), nullable=False)
     model = db.Column(db.String(50), nullable=False)
     year = db.Column(db.Integer, nullable=False)
-    vin = db.Column(db.String(17), nullable=False)
+    vin = db.Column(db.String(17), nullable=False, index=True)
 
     services = db.relationship('Service', back_populates='car', cascade="all, delete-orphan")
     user = db.relationship('User', back_populates='cars')
@@ -0,0 +1,34 @@
+from app.database.database import db
+
+
+class Counter(db.Model):
+    __tablename__ = "counters"
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {"name": self.name, "value": self.value}
+
+    def __repr__(self):
+        return str(self.to_dict())
+
+
+class UserCounter(db.Model):
+    __tablename__ = "user_counters"
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    total_cars = db.Column(db.Integer, nullable=False, default=0)
+    total_services = db.Column(db.Integer, nullable=False, default=0)
+    total_logins = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "total_cars": self.total_cars,
+            "total_services": self.total_services,
+            "total_logins": self.total_logins,
+        }
+
+    def __repr__(self):
+        return str(self.to_dict())
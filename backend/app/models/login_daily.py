@@ -0,0 +1,19 @@
+from app.database.database import db
+
+
+class LoginDaily(db.Model):
+    __tablename__ = "login_daily"
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    logins = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "day": self.day.isoformat() if self.day else None,
+            "logins": self.logins,
+        }
+
+    def __repr__(self):
+        return str(self.to_dict())
@@ -3,6 +3,10 @@ from app.database.database import db
 
 class LoginLogs(db.Model):
     __tablename__ = "login_logs"
+    __table_args__ = (
+        db.Index("ix_login_logs_user_open", "user_id", "logout_time", "login_time"),
+        db.Index("ix_login_logs_login_time", "login_time", "log_id"),
+    )
 
     log_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
@@ -6,7 +6,10 @@ class Service(db.Model):
 
     service_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     car_id = db.Column(
-        db.Integer, db.ForeignKey("cars.car_id", ondelete="CASCADE"), nullable=False
+        db.Integer,
+        db.ForeignKey("cars.car_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     mileage = db.Column(db.Integer, nullable=False)
     service_type = db.Column(db.Text, nullable=False)
@@ -17,19 +20,17 @@ class Service(db.Model):
 
     car = db.relationship('Car', back_populates='services')
 
+    # Dates and the Decimal cost are left to the JSON provider, so every
+    # endpoint encodes them the same way as the list queries ("49.90").
     def to_dict(self):
         return {
             "service_id": self.service_id,
             "car_id": self.car_id,
             "mileage": self.mileage,
             "service_type": self.service_type,
-            "service_date": (
-                self.service_date.isoformat() if self.service_date else None
-            ),
-            "next_service_date": (
-                self.next_service_date.isoformat() if self.next_service_date else None
-            ),
-            "cost": float(self.cost),
+            "service_date": self.service_date,
+            "next_service_date": self.next_service_date,
+            "cost": self.cost,
             "notes": self.notes,
         }
 
@@ -0,0 +1,14 @@
+from app.database.database import db
+
+
+class TableVersion(db.Model):
+    __tablename__ = "table_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {"name": self.name, "version": self.version}
+
+    def __repr__(self):
+        return str(self.to_dict())
@@ -0,0 +1,15 @@
+from app.database.database import db
+
+
+class TokenEpoch(db.Model):
+    __tablename__ = "token_epochs"
+
+    # No foreign key: a deleted user's epoch must outlive the user row.
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    epoch = db.Column(db.BigInteger, nullable=False)
+
+    def to_dict(self):
+        return {"user_id": self.user_id, "epoch": self.epoch}
+
+    def __repr__(self):
+        return str(self.to_dict())
@@ -5,10 +5,11 @@ class User(db.Model):
     __tablename__ = "users"
 
     user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    username = db.Column(db.String(50), nullable=False)
+    username = db.Column(db.String(50), nullable=False, index=True)
     role = db.Column(db.Enum("admin", "user", name="role_enum"), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
+    locked = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
 
     cars = db.relationship('Car', back_populates='user', cascade="all, delete-orphan")
     login_logs = db.relationship('LoginLogs', back_populates='user', cascade="all, delete-orphan")
@@ -0,0 +1,37 @@
+from app.database.database import db
+
+
+class VisitorPeriod(db.Model):
+    __tablename__ = "visitor_periods"
+
+    period = db.Column(db.String(10), primary_key=True)
+    start = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+    def to_dict(self):
+        return {
+            "period": self.period,
+            "start": self.start.isoformat() if self.start else None,
+            "user_id": self.user_id,
+        }
+
+    def __repr__(self):
+        return str(self.to_dict())
+
+
+class VisitorCount(db.Model):
+    __tablename__ = "visitor_counts"
+
+    period = db.Column(db.String(10), primary_key=True)
+    start = db.Column(db.Date, primary_key=True)
+    visitors = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "period": self.period,
+            "start": self.start.isoformat() if self.start else None,
+            "visitors": self.visitors,
+        }
+
+    def __repr__(self):
+        return str(self.to_dict())
@@ -1,10 +1,33 @@
 from datetime import datetime
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from app.services.admin_service import AdminService
-from app.utils.auth_utils import token_required
+from app.services.audit_writer import audit_writer
+from app.database.slow_query_log import slow_query_log
+from app.services.batch_service import BatchService
+from app.services.retention_service import RetentionService
+from app.services.visitor_service import DAY, MONTH, PERIODS, WEEK
+from app.services.import_service import ImportService, open_text_stream
+from app.services.export_service import EXPORT_FIELDS, EXPORT_FORMATS, MIMETYPES, ExportService
+from app.utils.auth_utils import admin_required, token_required
+from app.utils.etag import conditional_get, table_versions
+from app.utils.login_throttle import login_throttle
+from app.utils.metrics import request_metrics
+from app.utils.password_hasher import password_hasher
+from app.utils.principal_cache import principal_cache
+from app.utils.pagination import COUNT_MODES, InvalidCursor
 from app.utils.logging_config import logger
 from app.utils.constants import (
+    DELETE_SUCCESS,
     ERROR_FETCHING_DATA,
+    ERROR_SERVER_BUSY,
+    ERROR_INVALID_CURSOR,
+    ERROR_INVALID_COUNT_MODE,
+    ERROR_INVALID_IMPORT_FORMAT,
+    ERROR_INVALID_EXPORT,
+    ERROR_INVALID_DATE,
+    ERROR_INVALID_ORDER,
+    ERROR_INVALID_PERIOD,
+    ERROR_INVALID_BATCH,
     ERROR_NO_USERS_FOUND,
     ERROR_USER_NOT_FOUND,
     ERROR_NO_CARS_FOUND,
@@ -23,8 +46,13 @@ def get_users(current_user):
     try:
         page = request.args.get('page', default=1, type=int)
         per_page = request.args.get('per_page', default=10, type=int)
+        cursor = request.args.get('cursor')
+        count = request.args.get('count', default='exact')
 
-        users = AdminService.get_all_users(page=page, per_page=per_page)
+        if count not in COUNT_MODES:
+            return jsonify(message=ERROR_INVALID_COUNT_MODE), 400
+
+        users = AdminService.get_all_users(page=page, per_page=per_page, cursor=cursor, count=count)
 
         if users:
             return jsonify(users), 200
@@ -32,12 +60,16 @@ def get_users(current_user):
             logger.warning(ERROR_NO_USERS_FOUND)
             return jsonify(message=ERROR_NO_USERS_FOUND), 404
 
+    except InvalidCursor:
+        return jsonify(message=ERROR_INVALID_CURSOR), 400
+
     except Exception as e:
         logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
         return jsonify(message=ERROR_FETCHING_DATA), 500
 
 @admin_bp.route("/users/list", methods=["GET"])
 @token_required
+@conditional_get("users")
 def get_users_list(current_user):
     try:
         users = AdminService.get_users_list()
@@ -78,6 +110,8 @@ def add_user(current_user):
         role = data.get('role', 'user') 
 
         response = AdminService.add_user(username, email, password, role)
+        if response["message"] == ERROR_SERVER_BUSY:
+            return jsonify(response), 503, {"Retry-After": "1"}
         if "Error" in response["message"]:
             return jsonify(response), 400
 
@@ -99,6 +133,8 @@ def update_user(current_user, user_id):
         role = data.get('role') 
 
         response = AdminService.update_user(user_id, username, email, password, role)
+        if response["message"] == ERROR_SERVER_BUSY:
+            return jsonify(response), 503, {"Retry-After": "1"}
         if "Error" in response["message"]:
             return jsonify(response), 400
         
@@ -125,8 +161,13 @@ def get_cars(current_user):
     try:
         page = request.args.get('page', default=1, type=int)
         per_page = request.args.get('per_page', default=10, type=int)
+        cursor = request.args.get('cursor')
+        count = request.args.get('count', default='exact')
 
-        cars = AdminService.get_cars_with_user_name(page=page, per_page=per_page)
+        if count not in COUNT_MODES:
+            return jsonify(message=ERROR_INVALID_COUNT_MODE), 400
+
+        cars = AdminService.get_cars_with_user_name(page=page, per_page=per_page, cursor=cursor, count=count)
 
         if cars:
             return jsonify(cars), 200
@@ -134,12 +175,16 @@ def get_cars(current_user):
             logger.warning(ERROR_NO_CARS_FOUND)
             return jsonify(message=ERROR_NO_CARS_FOUND), 404
 
+    except InvalidCursor:
+        return jsonify(message=ERROR_INVALID_CURSOR), 400
+
     except Exception as e:
         logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
         return jsonify(message=ERROR_FETCHING_DATA), 500
 
 @admin_bp.route("/cars/list", methods=["GET"])
 @token_required
+@conditional_get("cars")
 def get_cars_list(current_user):
     try:
         cars = AdminService.get_cars_list()
@@ -155,6 +200,7 @@ def get_cars_list(current_user):
 
 @admin_bp.route("/car/<int:car_id>", methods=["GET"])
 @token_required
+@conditional_get("cars")
 def get_car(current_user, car_id):
     try:
         car = AdminService.get_car(car_id)
@@ -228,8 +274,13 @@ def get_services(current_user):
     try:
         page = request.args.get('page', default=1, type=int)
         per_page = request.args.get('per_page', default=10, type=int)
+        cursor = request.args.get('cursor')
+        count = request.args.get('count', default='exact')
 
-        services = AdminService.get_services_with_car_name(page=page, per_page=per_page)
+        if count not in COUNT_MODES:
+            return jsonify(message=ERROR_INVALID_COUNT_MODE), 400
+
+        services = AdminService.get_services_with_car_name(page=page, per_page=per_page, cursor=cursor, count=count)
 
         if services:
              return jsonify(services), 200
@@ -237,12 +288,16 @@ def get_services(current_user):
             logger.warning(ERROR_NO_SERVICES_FOUND)
             return jsonify(message=ERROR_NO_SERVICES_FOUND), 404
 
+    except InvalidCursor:
+        return jsonify(message=ERROR_INVALID_CURSOR), 400
+
     except Exception as e:
         logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
         return jsonify(message=ERROR_FETCHING_DATA), 500
 
 @admin_bp.route("/service/<int:service_id>", methods=["GET"])
 @token_required
+@conditional_get("services")
 def get_service(current_user, service_id):
     try:
         service = AdminService.get_service(service_id)
@@ -292,6 +347,63 @@ def add_service(current_user):
         logger.error(f"Error in add_service: {str(e)}")
         return jsonify({"message": "An unexpected error occurred."}), 500
 
+@admin_bp.route("/import_services", methods=["POST"])
+@token_required
+@admin_required
+def import_services(current_user):
+    try:
+        format_name = ImportService.detect_format(
+            request.args.get("format"), request.content_type
+        )
+        if not format_name:
+            return jsonify(message=ERROR_INVALID_IMPORT_FORMAT), 400
+
+        summary = ImportService.import_services(
+            open_text_stream(request.stream),
+            format_name,
+            batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+            max_errors=current_app.config["IMPORT_MAX_ERRORS"],
+        )
+        return jsonify(summary), 200
+
+    except Exception as e:
+        logger.error(f"Error in import_services: {str(e)}", exc_info=True)
+        return jsonify({"message": "An unexpected error occurred."}), 500
+
+@admin_bp.route("/batch_cars", methods=["POST"])
+@token_required
+@admin_required
+def batch_cars(current_user):
+    try:
+        operations = BatchService.parse_operations(
+            request.get_json(silent=True), current_app.config["BATCH_MAX_OPERATIONS"]
+        )
+        if operations is None:
+            return jsonify(message=ERROR_INVALID_BATCH), 400
+
+        return jsonify(BatchService.apply_cars(operations)), 200
+
+    except Exception as e:
+        logger.error(f"Error in batch_cars: {str(e)}", exc_info=True)
+        return jsonify({"message": "An unexpected error occurred."}), 500
+
+@admin_bp.route("/batch_services", methods=["POST"])
+@token_required
+@admin_required
+def batch_services(current_user):
+    try:
+        operations = BatchService.parse_operations(
+            request.get_json(silent=True), current_app.config["BATCH_MAX_OPERATIONS"]
+        )
+        if operations is None:
+            return jsonify(message=ERROR_INVALID_BATCH), 400
+
+        return jsonify(BatchService.apply_services(operations)), 200
+
+    except Exception as e:
+        logger.error(f"Error in batch_services: {str(e)}", exc_info=True)
+        return jsonify({"message": "An unexpected error occurred."}), 500
+
 @admin_bp.route("/update_service/<int:service_id>", methods=["PUT"])
 @token_required
 def update_service(current_user, service_id):
@@ -344,8 +456,19 @@ def get_logs_login(current_user):
     try:
         page = request.args.get('page', default=1, type=int)
         per_page = request.args.get('per_page', default=10, type=int)
+        cursor = request.args.get('cursor')
+        count = request.args.get('count', default='exact')
+        order = request.args.get('order', default='asc')
+
+        if count not in COUNT_MODES:
+            return jsonify(message=ERROR_INVALID_COUNT_MODE), 400
 
-        logs_login = AdminService.get_logs_login(page=page, per_page=per_page)
+        if order not in ("asc", "desc"):
+            return jsonify(message=ERROR_INVALID_ORDER), 400
+
+        logs_login = AdminService.get_logs_login(
+            page=page, per_page=per_page, cursor=cursor, count=count, descending=order == "desc"
+        )
 
         if logs_login:
             return jsonify(logs_login), 200
@@ -353,10 +476,40 @@ def get_logs_login(current_user):
             logger.warning(ERROR_NO_LOGS_LOGIN_FOUND)
             return jsonify(message=ERROR_NO_LOGS_LOGIN_FOUND), 404
 
+    except InvalidCursor:
+        return jsonify(message=ERROR_INVALID_CURSOR), 400
+
     except Exception as e:
         logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
         return jsonify(message=ERROR_FETCHING_DATA), 500
 
+@admin_bp.route("/logs_login", methods=["DELETE"])
+@token_required
+@admin_required
+def prune_logs_login(current_user):
+    try:
+        date_from = request.args.get("date_from")
+        date_to = request.args.get("date_to")
+
+        if not date_from and not date_to:
+            return jsonify(message=ERROR_INVALID_DATE), 400
+
+        try:
+            date_from = datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None
+            date_to = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else None
+        except ValueError:
+            return jsonify(message=ERROR_INVALID_DATE), 400
+
+        pruned = RetentionService.prune_range(date_from, date_to)
+        if pruned is None:
+            return jsonify({"message": "An unexpected error occurred."}), 500
+
+        return jsonify({"message": DELETE_SUCCESS, "pruned": pruned}), 200
+
+    except Exception as e:
+        logger.error(f"Error in prune_logs_login: {str(e)}", exc_info=True)
+        return jsonify({"message": "An unexpected error occurred."}), 500
+
 @admin_bp.route("/delete_log/<int:log_id>", methods=["DELETE"])
 @token_required
 def delete_log_login(current_user, log_id):
@@ -368,6 +521,45 @@ def delete_log_login(current_user, log_id):
         logger.error(f"Error in delete_log_login: {str(e)}", exc_info=True) 
         return jsonify({"message": "An unexpected error occurred."}), 500
 
+@admin_bp.route("/export/<string:kind>", methods=["GET"])
+@token_required
+@admin_required
+def export_data(current_user, kind):
+    try:
+        format_name = request.args.get("format", default="ndjson")
+
+        if kind not in EXPORT_FIELDS or format_name not in EXPORT_FORMATS:
+            return jsonify(message=ERROR_INVALID_EXPORT), 400
+
+        user_id = request.args.get("user_id", type=int)
+        date_from = request.args.get("date_from")
+        date_to = request.args.get("date_to")
+
+        try:
+            date_from = datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None
+            date_to = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else None
+        except ValueError:
+            return jsonify(message=ERROR_INVALID_DATE), 400
+
+        chunks = ExportService.stream(
+            kind,
+            format_name,
+            chunk_size=current_app.config["EXPORT_CHUNK_SIZE"],
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+        return Response(
+            stream_with_context(chunks),
+            mimetype=MIMETYPES[format_name],
+            headers={"Content-Disposition": f"attachment; filename={kind}.{format_name}"},
+        )
+
+    except Exception as e:
+        logger.error(f"Error in export_data: {str(e)}", exc_info=True)
+        return jsonify({"message": "An unexpected error occurred."}), 500
+
 @admin_bp.route('/dashboard_home', methods=['GET'])
 @token_required
 def get_dashboard_data(current_user):
@@ -382,10 +574,33 @@ def get_dashboard_data(current_user):
             'total_cars': total_cars,
             'total_services': total_services,
             'total_visitors': total_visitors,
+            'visitors_today': AdminService.get_period_visits(DAY),
+            'visitors_this_week': AdminService.get_period_visits(WEEK),
+            'visitors_this_month': AdminService.get_period_visits(MONTH),
         }), 200
     except Exception as e:
         logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
         return jsonify(message=ERROR_FETCHING_DATA), 500
+
+@admin_bp.route('/visitors', methods=['GET'])
+@token_required
+@admin_required
+def get_visitor_trend(current_user):
+    try:
+        period = request.args.get('period', default=DAY)
+        limit = request.args.get('limit', default=30, type=int)
+
+        if period not in PERIODS:
+            return jsonify(message=ERROR_INVALID_PERIOD), 400
+
+        trend = AdminService.get_visitor_trend(period, limit)
+        if trend is None:
+            return jsonify(message=ERROR_FETCHING_DATA), 500
+
+        return jsonify({'period': period, 'visitors': trend}), 200
+    except Exception as e:
+        logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
+        return jsonify(message=ERROR_FETCHING_DATA), 500
     
 @admin_bp.route('/search', methods=['GET'])
 @token_required
@@ -395,17 +610,45 @@ def search(current_user):
         per_page = request.args.get('per_page', default=10, type=int)
 
         query = request.args.get('query', '')
+        count = request.args.get('count', default='exact')
 
         if not query:
             return jsonify({'users': [], 'cars': [], 'services': []})
+
+        if count not in COUNT_MODES:
+            return jsonify(message=ERROR_INVALID_COUNT_MODE), 400
         
-        result = AdminService.search(query, page=page, per_page=per_page)
+        result = AdminService.search(query, page=page, per_page=per_page, count=count)
 
         return jsonify(result), 200
 
     except Exception as e:
         logger.error(f"{ERROR_FETCHING_DATA}: {e}", exc_info=True)
         return jsonify(message=ERROR_FETCHING_DATA), 500
-    
 
 
+@admin_bp.route('/cache_stats', methods=['GET'])
+@token_required
+@admin_required
+def get_cache_stats(current_user):
+    return jsonify({
+        'principal_cache': principal_cache.stats(),
+        'password_hasher': password_hasher.stats(),
+        'login_throttle': login_throttle.stats(),
+        'table_versions': table_versions.stats(),
+    }), 200
+
+
+@admin_bp.route('/metrics', methods=['GET'])
+@token_required
+@admin_required
+def get_metrics(current_user):
+    body = request_metrics.render({
+        'principal_cache': principal_cache.stats(),
+        'password_hasher': password_hasher.stats(),
+        'login_throttle': login_throttle.stats(),
+        'audit_writer': audit_writer.stats(),
+        'slow_queries': slow_query_log.stats(),
+        'table': {'version': table_versions.stats()},
+    })
+    return Response(body, mimetype='text/plain; version=0.0.4')
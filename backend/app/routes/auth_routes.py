@@ -3,30 +3,43 @@ from app.utils.auth_utils import token_required
 from app.utils.auth_utils import authenticate
 from app.utils.logging_config import logger
 from app.services.auth_service import log_login
-from app.utils.constants import ERROR_USER_NOT_FOUND
+from app.utils.constants import ERROR_SERVER_BUSY, ERROR_TOO_MANY_ATTEMPTS, ERROR_USER_NOT_FOUND
+from app.utils.login_throttle import login_throttle
+from app.utils.password_hasher import PasswordHasherBusy
 from app.models.user import User
 from app.services.auth_service import log_logout
-from app.utils.constants import ERROR_USER_NOT_FOUND
 
 auth_bp = Blueprint("auth_routes", __name__)
 
 
 @auth_bp.route("/", methods=["POST"])
 def login():
-    data = request.json  
-    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+
     username = data.get("username")
     password = data.get("password")
 
     if not username or not password:
         return jsonify(message="Username and password are required"), 400
 
-    try:
-        success, access_token, role, username = authenticate(username, password)
+    if not isinstance(username, str) or not isinstance(password, str):
+        return jsonify(message="Username and password must be strings"), 400
 
-        ip_address = request.remote_addr
+    ip_address = request.remote_addr
+
+    retry_after, attempt = login_throttle.try_acquire(username, ip_address)
+    if retry_after:
+        logger.warning(f"Throttled login attempt for username: {username} from {ip_address}")
+        return jsonify(message=ERROR_TOO_MANY_ATTEMPTS), 429, {"Retry-After": str(retry_after)}
+
+    try:
+        success, access_token, role, _ = authenticate(username, password)
 
         if success:
+            login_throttle.release(username, ip_address, attempt)
+            login_throttle.reset(username)
             user = User.query.filter_by(username=username).first()
 
             if user:
@@ -39,6 +52,10 @@ def login():
         else:
             logger.warning(f"Invalid login attempt for username: {username}")
             return jsonify(message="Invalid credentials"), 401
+    except PasswordHasherBusy:
+        login_throttle.release(username, ip_address, attempt)
+        logger.warning(f"Password hashing queue full, rejecting login for: {username}")
+        return jsonify(message=ERROR_SERVER_BUSY), 503, {"Retry-After": "1"}
     except Exception as e:
         logger.error(f"Error during login: {e}")
         return jsonify(message="An error occurred while processing your request"), 500
@@ -48,13 +65,8 @@ def login():
 @token_required
 def logout(current_user):
     try:
-        user = User.query.filter_by(username=current_user.username).first()
-
-        if user:
-            log_logout(user.user_id)
-            return jsonify(message="Logout successful"), 200
-        else:
-            return jsonify(message=ERROR_USER_NOT_FOUND), 404
+        log_logout(current_user.user_id)
+        return jsonify(message="Logout successful"), 200
     except Exception as e:
         logger.error(f"Error during logout: {e}")
         return jsonify(message="An error occurred while processing your request"), 500
\ No newline at end of file
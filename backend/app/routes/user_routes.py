@@ -1,10 +1,19 @@
 from datetime import datetime
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from app.services.user_service import UserService
+from app.services.import_service import ImportService, open_text_stream
+from app.services.batch_service import BatchService
 from app.utils.auth_utils import token_required
+from app.utils.etag import conditional_get
 from app.utils.logging_config import logger
+from app.utils.pagination import COUNT_MODES, InvalidCursor
 from app.utils.constants import (
     ERROR_USER_NOT_FOUND,
+    ERROR_SERVER_BUSY,
+    ERROR_INVALID_CURSOR,
+    ERROR_INVALID_COUNT_MODE,
+    ERROR_INVALID_IMPORT_FORMAT,
+    ERROR_INVALID_BATCH,
     ERROR_NO_CARS_FOUND,
     ERROR_CAR_NOT_FOUND,
     ERROR_SERVICE_NOT_FOUND,
@@ -47,6 +56,8 @@ def update_profile(current_user):
     password = data.get("password")
 
     response = UserService.update_profile(current_user, username, email, password)
+    if response["message"] == ERROR_SERVER_BUSY:
+        return jsonify(response), 503, {"Retry-After": "1"}
     if "Error" in response["message"]:
             return jsonify(response), 400
         
@@ -55,11 +66,20 @@ def update_profile(current_user):
 
 @user_bp.route("/cars", methods=["GET"])
 @token_required
+@conditional_get("cars")
 def load_cars(current_user):
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=10, type=int)
+    cursor = request.args.get('cursor')
+    count = request.args.get('count', default='exact')
 
-    cars = UserService.get_cars_for_user(current_user, page=page, per_page=per_page)
+    if count not in COUNT_MODES:
+        return jsonify({"message": ERROR_INVALID_COUNT_MODE}), 400
+
+    try:
+        cars = UserService.get_cars_for_user(current_user, page=page, per_page=per_page, cursor=cursor, count=count)
+    except InvalidCursor:
+        return jsonify({"message": ERROR_INVALID_CURSOR}), 400
 
     if not cars:
         return jsonify({"message": ERROR_NO_CARS_FOUND}), 404
@@ -80,6 +100,7 @@ def get_all_car_ids_and_names(current_user):
 
 @user_bp.route("/car/<int:car_id>", methods=["GET"])
 @token_required
+@conditional_get("cars")
 def get_car(current_user, car_id):
     car = UserService.get_car(car_id)
 
@@ -137,12 +158,21 @@ def delete_car(current_user, car_id):
 
 @user_bp.route("/services", methods=["GET"])
 @token_required
+@conditional_get("services", "cars")
 def load_services(current_user):
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=10, type=int)
     car_id = request.args.get("car_id", type=int)  
+    cursor = request.args.get('cursor')
+    count = request.args.get('count', default='exact')
+
+    if count not in COUNT_MODES:
+        return jsonify({"message": ERROR_INVALID_COUNT_MODE}), 400
 
-    services = UserService.get_services_for_car(car_id, page=page, per_page=per_page)
+    try:
+        services = UserService.get_services_for_car(car_id, page=page, per_page=per_page, cursor=cursor, count=count)
+    except InvalidCursor:
+        return jsonify({"message": ERROR_INVALID_CURSOR}), 400
 
     if not services:
         return jsonify({"message": ERROR_NO_SERVICES_FOUND}), 404
@@ -152,6 +182,7 @@ def load_services(current_user):
 
 @user_bp.route("/service/<int:service_id>", methods=["GET"])
 @token_required
+@conditional_get("services")
 def get_service(current_user, service_id):
     service = UserService.get_service(service_id)
 
@@ -194,6 +225,51 @@ def add_service(current_user):
     return jsonify(response), 200
 
 
+@user_bp.route("/import_services", methods=["POST"])
+@token_required
+def import_services(current_user):
+    format_name = ImportService.detect_format(request.args.get("format"), request.content_type)
+
+    if not format_name:
+        return jsonify({"message": ERROR_INVALID_IMPORT_FORMAT}), 400
+
+    summary = ImportService.import_services(
+        open_text_stream(request.stream),
+        format_name,
+        owner_id=current_user.user_id,
+        batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+        max_errors=current_app.config["IMPORT_MAX_ERRORS"],
+    )
+
+    return jsonify(summary), 200
+
+
+@user_bp.route("/batch_cars", methods=["POST"])
+@token_required
+def batch_cars(current_user):
+    operations = BatchService.parse_operations(
+        request.get_json(silent=True), current_app.config["BATCH_MAX_OPERATIONS"]
+    )
+    if operations is None:
+        return jsonify({"message": ERROR_INVALID_BATCH}), 400
+
+    summary = BatchService.apply_cars(operations, owner_id=current_user.user_id)
+    return jsonify(summary), 200
+
+
+@user_bp.route("/batch_services", methods=["POST"])
+@token_required
+def batch_services(current_user):
+    operations = BatchService.parse_operations(
+        request.get_json(silent=True), current_app.config["BATCH_MAX_OPERATIONS"]
+    )
+    if operations is None:
+        return jsonify({"message": ERROR_INVALID_BATCH}), 400
+
+    summary = BatchService.apply_services(operations, owner_id=current_user.user_id)
+    return jsonify(summary), 200
+
+
 @user_bp.route("/update_service/<int:service_id>", methods=["PUT"])
 @token_required
 def update_service(current_user, service_id):
@@ -238,10 +314,14 @@ def search(current_user):
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=10, type=int)
     query = request.args.get('query', '')
+    count = request.args.get('count', default='exact')
 
     if not query:
         return jsonify({'cars': [], 'services': []})
+
+    if count not in COUNT_MODES:
+        return jsonify({"message": ERROR_INVALID_COUNT_MODE}), 400
         
-    result = UserService.search(current_user, query, page=page, per_page=per_page)
+    result = UserService.search(current_user, query, page=page, per_page=per_page, count=count)
 
     return jsonify(result), 200
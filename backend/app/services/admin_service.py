@@ -1,5 +1,6 @@
+from flask import current_app
 from sqlalchemy.sql import or_
-from sqlalchemy.orm import load_only
+from sqlalchemy.orm import joinedload, load_only
 from app.models.user import User
 from app.models.car import Car
 from app.models.service import Service
@@ -7,14 +8,25 @@ from app.models.login_logs import LoginLogs
 from app.utils.logging_config import logger
 from app.database.database import db
 from app.utils.auth_utils import hash_password
+from app.utils.password_hasher import PasswordHasherBusy
+from app.utils.principal_cache import principal_cache
+from app.utils.token_epochs import token_epochs
+from app.utils.pagination import InvalidCursor, keyset_paginate, paginate_query
+from app.services.counter_service import CounterService, USERS, CARS, SERVICES, VISITORS
+from app.services.visitor_service import VisitorService
+from app.services.search_index import SearchIndex
+from app.services.purge_service import PurgeService
 from app.utils.validation import validate_email, validate_username, validate_vin
 from app.utils.constants import (
     ADD_SUCCESS,
     UPDATE_SUCCESS,
     DELETE_SUCCESS,
+    DELETE_SCHEDULED,
+    DELETE_IN_PROGRESS,
     ERROR_CAR_NOT_FOUND,
     ERROR_NO_USERS_FOUND,
     ERROR_USER_NOT_FOUND,
+    ERROR_SERVER_BUSY,
     ERROR_NO_CARS_FOUND,
     ERROR_SERVICE_NOT_FOUND,
     ERROR_NO_LOGS_LOGIN_FOUND,
@@ -25,10 +37,24 @@ from app.utils.constants import (
 
 class AdminService:
     @staticmethod
-    def get_all_users(page=1, per_page=10):
+    def get_all_users(page=1, per_page=10, cursor=None, count="exact"):
         try:
-            pagination = User.query.paginate(
-                page=page, per_page=per_page, error_out=False
+            if cursor is not None:
+                keyset = keyset_paginate(
+                    User.query,
+                    [User.user_id],
+                    cursor,
+                    per_page,
+                    key=lambda user: [user.user_id],
+                )
+                return {
+                    "users": [user.to_dict() for user in keyset.items],
+                    "next_cursor": keyset.next_cursor,
+                    "per_page": keyset.per_page,
+                }
+
+            pagination = paginate_query(
+                User.query.order_by(User.user_id), page, per_page, count
             )
             if pagination.items:
                 users = [user.to_dict() for user in pagination.items]
@@ -39,17 +65,21 @@ class AdminService:
                     "total_pages": pagination.pages,
                     "current_page": pagination.page,
                     "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
                 return results
             else:
                 logger.warning(ERROR_NO_USERS_FOUND)
                 return {
                     "users": [],
-                    "total_users": 0,
-                    "total_pages": 0,
-                    "current_page": page,
-                    "per_page": per_page,
+                    "total_users": pagination.total,
+                    "total_pages": pagination.pages,
+                    "current_page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
+        except InvalidCursor:
+            raise
         except Exception as e:
             logger.error(f"Error in get_all_users: {str(e)}")
             return {
@@ -58,6 +88,7 @@ class AdminService:
                 "total_pages": 0,
                 "current_page": page,
                 "per_page": per_page,
+                "has_next": False,
             }
 
     @staticmethod
@@ -97,6 +128,10 @@ class AdminService:
             db.session.add(new_user)
             db.session.commit()
             return {"message": ADD_SUCCESS}
+        except PasswordHasherBusy:
+            db.session.rollback()
+            logger.warning("Password hashing queue full in add_user")
+            return {"message": ERROR_SERVER_BUSY}
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error in add_user: {str(e)}")
@@ -111,6 +146,8 @@ class AdminService:
                 return {"message": ERROR_USER_NOT_FOUND}
             
             updated = False
+            revoke_tokens = False
+            old_username = user.username
 
             if username and username != user.username:
                 username_error = validate_username(username)
@@ -129,17 +166,26 @@ class AdminService:
             if password:
                 user.password = hash_password(password)
                 updated = True
+                revoke_tokens = True
 
             if role and role in ["admin", "user"] and role != user.role:
                 user.role = role
                 updated = True
+                revoke_tokens = True
 
             if updated:
                 db.session.commit()
+                principal_cache.invalidate(old_username)
+                if revoke_tokens:
+                    token_epochs.bump(user_id)
                 return {"message": UPDATE_SUCCESS}
             else:
                 return {"message": "No changes made."}
 
+        except PasswordHasherBusy:
+            db.session.rollback()
+            logger.warning("Password hashing queue full in update_user")
+            return {"message": ERROR_SERVER_BUSY}
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error in update_user: {str(e)}")
@@ -159,8 +205,17 @@ class AdminService:
             if user.role == 'admin':
                 return {"message": "Admin cannot delete other admins."}, 400
             
-            db.session.delete(user)
-            db.session.commit()
+            username = user.username
+
+            if PurgeService.account_size(user_id) > current_app.config.get("PURGE_INLINE_LIMIT", 5000):
+                scheduled = PurgeService.schedule_purge(user_id)
+                principal_cache.invalidate(username)
+                token_epochs.bump(user_id)
+                return {"message": DELETE_SCHEDULED if scheduled else DELETE_IN_PROGRESS}, 202
+
+            PurgeService.delete_user(user_id)
+            principal_cache.invalidate(username)
+            token_epochs.bump(user_id)
 
             return {"message": DELETE_SUCCESS}, 200
         except Exception as e:
@@ -169,44 +224,61 @@ class AdminService:
             return {"message": "An unexpected error occurred."}, 500
 
     @staticmethod
-    def get_cars_with_user_name(page=1, per_page=10):
+    def get_cars_with_user_name(page=1, per_page=10, cursor=None, count="exact"):
         try:
-            pagination = (
-                db.session.query(Car, User.username.label("owner"))
-                .join(User, Car.user_id == User.user_id)
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = db.session.query(
+                Car.car_id,
+                Car.user_id,
+                User.username.label("owner"),
+                Car.name,
+                Car.model,
+                Car.year,
+                Car.vin,
+            ).join(User, Car.user_id == User.user_id)
+
+            def to_car_list(rows):
+                return [row._asdict() for row in rows]
+
+            if cursor is not None:
+                keyset = keyset_paginate(
+                    query,
+                    [Car.car_id],
+                    cursor,
+                    per_page,
+                    key=lambda row: [row.car_id],
+                )
+                return {
+                    "cars": to_car_list(keyset.items),
+                    "next_cursor": keyset.next_cursor,
+                    "per_page": keyset.per_page,
+                }
+
+            pagination = paginate_query(
+                query.order_by(Car.car_id), page, per_page, count
             )
             if pagination.items:
-                car_list = []
-                for car, owner in pagination.items:
-                    car_list.append(
-                        {
-                            "car_id": car.car_id,
-                            "user_id": car.user_id,
-                            "owner": owner,
-                            "name": car.name,
-                            "model": car.model,
-                            "year": car.year,
-                            "vin": car.vin,
-                        }
-                    )
+                car_list = to_car_list(pagination.items)
                 result = {
                     "cars": car_list,
                     "total_cars": pagination.total,
                     "total_pages": pagination.pages,
                     "current_page": pagination.page,
                     "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
                 return result
             else:
                 logger.warning(ERROR_NO_CARS_FOUND)
                 return {
                     "cars": [],
-                    "total_cars": 0,
-                    "total_pages": 0,
-                    "current_page": page,
-                    "per_page": per_page,
+                    "total_cars": pagination.total,
+                    "total_pages": pagination.pages,
+                    "current_page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
+        except InvalidCursor:
+            raise
         except Exception as e:
             logger.error(f"Error in get_cars_with_user_name: {str(e)}")
             return {
@@ -215,6 +287,7 @@ class AdminService:
                 "total_pages": 0,
                 "current_page": page,
                 "per_page": per_page,
+                "has_next": False,
             }
 
     @staticmethod
@@ -297,14 +370,10 @@ class AdminService:
     @staticmethod
     def delete_car(car_id):
         try:
-            car = Car.query.get(car_id)
-            if not car:
+            if not PurgeService.delete_car(car_id):
                 logger.warning(ERROR_CAR_NOT_FOUND)
                 return {"message": ERROR_CAR_NOT_FOUND}, 404
-            
-            db.session.delete(car)
-            db.session.commit()
-            
+
             return {"message": DELETE_SUCCESS}, 200
         except Exception as e:
             db.session.rollback()
@@ -312,30 +381,43 @@ class AdminService:
             return {"message": "An unexpected error occurred."}, 500
 
     @staticmethod
-    def get_services_with_car_name(page=1, per_page=10):
+    def get_services_with_car_name(page=1, per_page=10, cursor=None, count="exact"):
         try:
-            pagination = (
-                db.session.query(Service, Car.name.label("car_name"))
-                .join(Car, Service.car_id == Car.car_id)
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = db.session.query(
+                Service.service_id,
+                Service.car_id,
+                Car.name.label("car_name"),
+                Service.mileage,
+                Service.service_type,
+                Service.service_date,
+                Service.next_service_date,
+                Service.cost,
+                Service.notes,
+            ).join(Car, Service.car_id == Car.car_id)
+
+            def to_service_list(rows):
+                return [row._asdict() for row in rows]
+
+            if cursor is not None:
+                keyset = keyset_paginate(
+                    query,
+                    [Service.service_id],
+                    cursor,
+                    per_page,
+                    key=lambda row: [row.service_id],
+                )
+                return {
+                    "services": to_service_list(keyset.items),
+                    "next_cursor": keyset.next_cursor,
+                    "per_page": keyset.per_page,
+                }
+
+            pagination = paginate_query(
+                query.order_by(Service.service_id), page, per_page, count
             )
 
             if pagination.items:
-                service_list = []
-                for service, car_name in pagination.items:
-                    service_list.append(
-                        {
-                            "service_id": service.service_id,
-                            "car_id": service.car_id,
-                            "car_name": car_name,
-                            "mileage": service.mileage,
-                            "service_type": service.service_type,
-                            "service_date": service.service_date,
-                            "next_service_date": service.next_service_date,
-                            "cost": service.cost,
-                            "notes": service.notes,
-                        }
-                    )
+                service_list = to_service_list(pagination.items)
 
                 result = {
                     "services": service_list,
@@ -343,17 +425,21 @@ class AdminService:
                     "total_pages": pagination.pages,
                     "current_page": pagination.page,
                     "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
                 return result
             else:
                 logger.warning(ERROR_NO_SERVICES_FOUND)
                 return {
                     "services": [],
-                    "total_services": 0,
-                    "total_pages": 0,
-                    "current_page": page,
-                    "per_page": per_page,
+                    "total_services": pagination.total,
+                    "total_pages": pagination.pages,
+                    "current_page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
+        except InvalidCursor:
+            raise
         except Exception as e:
             logger.error(f"Error in get_services_with_car_name: {str(e)}")
             return {
@@ -362,6 +448,7 @@ class AdminService:
                 "total_pages": 0,
                 "current_page": page,
                 "per_page": per_page,
+                "has_next": False,
             }
 
     @staticmethod
@@ -451,44 +538,74 @@ class AdminService:
             return {"message": "An unexpected error occurred."}, 500
 
     @staticmethod
-    def get_logs_login(page=1, per_page=10):
+    def get_logs_login(page=1, per_page=10, cursor=None, count="exact", descending=False):
         try:
-            pagination = (
-                db.session.query(LoginLogs)
-                .order_by(LoginLogs.login_time.asc()) 
-                .paginate(page=page, per_page=per_page, error_out=False)
+            query = db.session.query(LoginLogs)
+
+            def to_log_list(logs):
+                return [
+                    {
+                        "log_id": log.log_id,
+                        "user_id": log.user_id,
+                        "login_time": log.login_time,
+                        "logout_time": log.logout_time,
+                        "ip_address": log.ip_address,
+                    }
+                    for log in logs
+                ]
+
+            if cursor is not None:
+                keyset = keyset_paginate(
+                    query,
+                    [LoginLogs.login_time, LoginLogs.log_id],
+                    cursor,
+                    per_page,
+                    key=lambda log: [log.login_time, log.log_id],
+                    descending=descending,
+                )
+                return {
+                    "logs": to_log_list(keyset.items),
+                    "next_cursor": keyset.next_cursor,
+                    "per_page": keyset.per_page,
+                }
+
+            pagination = paginate_query(
+                query.order_by(
+                    *(
+                        (LoginLogs.login_time.desc(), LoginLogs.log_id.desc())
+                        if descending
+                        else (LoginLogs.login_time.asc(), LoginLogs.log_id.asc())
+                    )
+                ),
+                page,
+                per_page,
+                count,
             )
 
             if pagination.items:
-                log_list = []
-                for log in pagination.items:
-                    log_list.append(
-                        {
-                            "log_id": log.log_id,
-                            "user_id": log.user_id,
-                            "login_time": log.login_time,
-                            "logout_time": log.logout_time,
-                            "ip_address": log.ip_address,
-                        }
-                    )
+                log_list = to_log_list(pagination.items)
                 result = {
                     "logs": log_list,
                     "total_logs": pagination.total,
                     "total_pages": pagination.pages,
                     "current_page": pagination.page,
                     "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
                 return result
             else:
                 logger.warning(ERROR_NO_LOGS_LOGIN_FOUND)
                 return {
                     "logs": [],
-                    "total_logs": 0,
-                    "total_pages": 0,
-                    "current_page": page,
-                    "per_page": per_page,
+                    "total_logs": pagination.total,
+                    "total_pages": pagination.pages,
+                    "current_page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
             
+        except InvalidCursor:
+            raise
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error in get_logs_login: {str(e)}")
@@ -498,6 +615,7 @@ class AdminService:
                 "total_pages": 0,
                 "current_page": page,
                 "per_page": per_page,
+                "has_next": False,
             }
 
     @staticmethod
@@ -519,68 +637,85 @@ class AdminService:
 
     @staticmethod
     def get_total_users():
-        try:
-            return User.query.count()
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error in get_total_users: {str(e)}")
-            return 0
+        return CounterService.get(USERS)
 
     @staticmethod
     def get_total_cars():
-        try:
-            return Car.query.count()
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error in get_total_cars: {str(e)}")
-            return 0
+        return CounterService.get(CARS)
 
     @staticmethod
     def get_total_services():
-        try:
-            return Service.query.count()
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error in get_total_services: {str(e)}")
-            return 0
+        return CounterService.get(SERVICES)
 
     @staticmethod
     def get_total_user_visits():
-        try:
-            return LoginLogs.query.with_entities(LoginLogs.user_id).distinct().count()
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error in get_total_user_visits: {str(e)}")
-            return 0
+        return CounterService.get(VISITORS)
+
+    @staticmethod
+    def get_period_visits(period):
+        return VisitorService.current(period)
+
+    @staticmethod
+    def get_visitor_trend(period, limit):
+        return VisitorService.trend(period, limit)
 
     @staticmethod
-    def search(query, page=1, per_page=10):
+    def search(query, page=1, per_page=10, count="exact"):
         if not query:
             return {"users": [], "cars": [], "services": []}
         try:
-            users = User.query.filter(
-                or_(
+            expression = SearchIndex.match_expression(query) if SearchIndex.enabled() else ""
+            if expression:
+                user_filter = User.user_id.in_(
+                    SearchIndex.matching_ids("users_fts", expression)
+                )
+                car_filter = Car.car_id.in_(
+                    SearchIndex.matching_ids("cars_fts", expression)
+                )
+                service_filter = Service.service_id.in_(
+                    SearchIndex.matching_ids("services_fts", expression)
+                )
+            else:
+                user_filter = or_(
                     User.username.contains(query),
                     User.role.contains(query),
                     User.email.contains(query),
                 )
-            ).paginate(page=page, per_page=per_page, error_out=False)
-
-            cars = Car.query.filter(
-                or_(
+                car_filter = or_(
                     Car.name.contains(query),
                     Car.model.contains(query),
                     Car.vin.contains(query),
                 )
-            ).paginate(page=page, per_page=per_page, error_out=False)
-
-            services = Service.query.filter(
-                or_(
+                service_filter = or_(
                     Service.service_type.contains(query),
                     Service.mileage.contains(query),
                     Service.cost.contains(query),
                 )
-            ).paginate(page=page, per_page=per_page, error_out=False)
+
+            users = paginate_query(
+                User.query.filter(user_filter).order_by(User.user_id),
+                page,
+                per_page,
+                count,
+            )
+
+            cars = paginate_query(
+                Car.query.options(joinedload(Car.user).load_only(User.username))
+                .filter(car_filter)
+                .order_by(Car.car_id),
+                page,
+                per_page,
+                count,
+            )
+
+            services = paginate_query(
+                Service.query.options(joinedload(Service.car).load_only(Car.name))
+                .filter(service_filter)
+                .order_by(Service.service_id),
+                page,
+                per_page,
+                count,
+            )
 
             return {
                 "users": {
@@ -588,6 +723,7 @@ class AdminService:
                     "total": users.total,
                     "total_pages": users.pages,
                     "current_page": users.page,
+                    "has_next": users.has_next,
                 },
                 "cars": {
                     "data": [
@@ -597,6 +733,7 @@ class AdminService:
                     "total": cars.total,
                     "total_pages": cars.pages,
                     "current_page": cars.page,
+                    "has_next": cars.has_next,
                 },
                 "services": {
                     "data": [
@@ -609,6 +746,7 @@ class AdminService:
                     "total": services.total,
                     "total_pages": services.pages,
                     "current_page": services.page,
+                    "has_next": services.has_next,
                 },
             }
 
@@ -0,0 +1,159 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from app.models.login_logs import LoginLogs
+from app.utils.logging_config import logger
+from app.database.database import db
+from app.database.sqlite_profile import run_with_retry
+
+
+LOGIN = "login"
+LOGOUT = "logout"
+
+_STOP = object()
+
+
+class AuditWriter:
+    def __init__(self):
+        self.app = None
+        self.mode = "sync"
+        self.batch_size = 100
+        self.flush_interval = 0.5
+        self.written = 0
+        self.failed = 0
+        self.fallbacks = 0
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shutdown()
+
+        self.app = app
+        self.mode = app.config.get("AUDIT_WRITE_MODE", "sync")
+        self.batch_size = app.config.get("AUDIT_BATCH_SIZE", 100)
+        self.flush_interval = app.config.get("AUDIT_FLUSH_INTERVAL", 0.5)
+
+        if self.mode == "async":
+            self._queue = queue.Queue(maxsize=app.config.get("AUDIT_QUEUE_SIZE", 10000))
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def log_login(self, user_id, ip_address):
+        self._submit((LOGIN, user_id, datetime.now(timezone.utc), ip_address))
+
+    def log_logout(self, user_id):
+        self._submit((LOGOUT, user_id, datetime.now(timezone.utc), None))
+
+    def _submit(self, audit_event):
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(audit_event)
+                return
+            except queue.Full:
+                with self._lock:
+                    self.fallbacks += 1
+
+        self._write([audit_event])
+
+    def flush(self):
+        if self._queue is not None:
+            self._queue.join()
+
+    def shutdown(self):
+        if self._thread is None:
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "failed": self.failed,
+            "fallbacks": self.fallbacks,
+        }
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # The first event starts the clock, so a steady trickle cannot
+            # hold a partial batch back longer than flush_interval.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            events = [audit_event for audit_event in batch if audit_event is not _STOP]
+
+            if events:
+                with self.app.app_context():
+                    self._write(events)
+                    db.session.remove()
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if stop:
+                return
+
+    def _write(self, events):
+        def write():
+            for kind, user_id, timestamp, ip_address in events:
+                if kind == LOGIN:
+                    db.session.add(
+                        LoginLogs(
+                            user_id=user_id,
+                            login_time=timestamp,
+                            logout_time=None,
+                            ip_address=ip_address,
+                        )
+                    )
+                else:
+                    log_entry = (
+                        LoginLogs.query.filter_by(user_id=user_id, logout_time=None)
+                        .order_by(LoginLogs.login_time.desc())
+                        .first()
+                    )
+                    if log_entry:
+                        log_entry.logout_time = timestamp
+            db.session.commit()
+
+        try:
+            run_with_retry(write)
+            with self._lock:
+                self.written += len(events)
+        except Exception as e:
+            db.session.rollback()
+            if len(events) > 1:
+                # Retry one by one so a single bad event (e.g. a login for a
+                # user deleted meanwhile) does not drop the rest of the batch.
+                logger.warning(f"Error writing {len(events)} audit events, retrying singly: {str(e)}")
+                for audit_event in events:
+                    self._write([audit_event])
+                return
+
+            kind, user_id, timestamp, _ = events[0]
+            with self._lock:
+                self.failed += 1
+            logger.error(
+                f"Dropped audit event {kind} for user {user_id} at {timestamp.isoformat()}: {str(e)}"
+            )
+
+
+audit_writer = AuditWriter()
+atexit.register(audit_writer.shutdown)
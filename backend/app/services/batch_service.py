@@ -0,0 +1,433 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import delete, func, insert, select, update
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.utils.logging_config import logger
+from app.database.database import db
+from app.services.counter_service import CounterService, CARS, SERVICES
+from app.utils.constants import (
+    ADD_SUCCESS,
+    UPDATE_SUCCESS,
+    DELETE_SUCCESS,
+    NO_CHANGES_MADE,
+    ERROR_CAR_NOT_FOUND,
+    ERROR_SERVICE_NOT_FOUND,
+    ERROR_USER_NOT_FOUND,
+    ERROR_VIN_EXISTS,
+)
+
+
+BATCH_OPERATIONS = ("add", "update", "delete")
+
+CAR_FIELDS = ("name", "model", "year", "vin")
+TEXT_FIELDS = ("name", "model", "vin", "type", "date", "nextDate", "notes")
+NUMBER_FIELDS = ("year", "mileage", "cost")
+# add_car and add_service take userID and carID, so batches accept both spellings.
+ID_ALIASES = {"user_id": "userID", "car_id": "carID"}
+
+SERVICE_FIELDS = {
+    "mileage": "mileage",
+    "type": "service_type",
+    "date": "service_date",
+    "nextDate": "next_service_date",
+    "cost": "cost",
+    "notes": "notes",
+}
+
+
+class BatchService:
+    @staticmethod
+    def parse_operations(data, max_operations):
+        operations = data.get("operations") if isinstance(data, dict) else None
+
+        if not isinstance(operations, list) or not operations:
+            return None
+        if len(operations) > max_operations:
+            return None
+
+        return operations
+
+    @staticmethod
+    def apply_cars(operations, owner_id=None):
+        results = [None] * len(operations)
+        adds, updates, deletes = [], [], []
+        seen = set()
+
+        for index, operation in enumerate(operations):
+            try:
+                kind = _operation_kind(operation)
+                if kind == "add":
+                    row = _parse_car_fields(operation, partial=False)
+                    row["user_id"] = owner_id if owner_id is not None else _parse_id(operation, "user_id")
+                    adds.append((index, row))
+                else:
+                    car_id = _parse_id(operation, "car_id")
+                    if car_id in seen:
+                        raise ValueError("Car appears more than once in batch.")
+                    seen.add(car_id)
+
+                    if kind == "update":
+                        updates.append((index, car_id, _parse_car_fields(operation, partial=True)))
+                    else:
+                        deletes.append((index, car_id))
+            except ValueError as e:
+                results[index] = _error(index, str(e))
+
+        target_ids = [car_id for _, car_id, _ in updates] + [car_id for _, car_id in deletes]
+        cars = {
+            row.car_id: row
+            for row in db.session.execute(
+                select(Car.car_id, Car.user_id, Car.vin).where(Car.car_id.in_(target_ids))
+            )
+        } if target_ids else {}
+
+        def owned(car_id):
+            car = cars.get(car_id)
+            return car is not None and (owner_id is None or car.user_id == owner_id)
+
+        users = set()
+        if owner_id is None and adds:
+            user_ids = {row["user_id"] for _, row in adds}
+            users = set(db.session.execute(select(User.user_id).where(User.user_id.in_(user_ids))).scalars())
+
+        vins = {row["vin"] for _, row in adds} | {row["vin"] for _, _, row in updates if row.get("vin")}
+        taken_vins = set()
+        if vins:
+            taken_vins = set(db.session.execute(select(Car.vin).where(Car.vin.in_(vins))).scalars())
+
+        def claim_vin(index, vin):
+            if vin in taken_vins:
+                results[index] = _error(index, ERROR_VIN_EXISTS)
+                return False
+            taken_vins.add(vin)
+            return True
+
+        valid_deletes = []
+        for index, car_id in deletes:
+            if owned(car_id):
+                valid_deletes.append((index, car_id))
+            else:
+                results[index] = _error(index, ERROR_CAR_NOT_FOUND)
+
+        valid_updates = []
+        for index, car_id, row in updates:
+            if not owned(car_id):
+                results[index] = _error(index, ERROR_CAR_NOT_FOUND)
+                continue
+
+            if row.get("vin") == cars[car_id].vin:
+                del row["vin"]
+            if row.get("vin") and not claim_vin(index, row["vin"]):
+                continue
+
+            if row:
+                valid_updates.append((index, car_id, row))
+            else:
+                results[index] = _ok(index, NO_CHANGES_MADE, car_id=car_id)
+
+        valid_adds = []
+        for index, row in adds:
+            if owner_id is None and row["user_id"] not in users:
+                results[index] = _error(index, ERROR_USER_NOT_FOUND)
+            elif claim_vin(index, row["vin"]):
+                valid_adds.append((index, row))
+
+        try:
+            connection = db.session.connection()
+
+            new_ids = []
+            if valid_adds:
+                new_ids = db.session.execute(
+                    insert(Car).returning(Car.car_id, sort_by_parameter_order=True),
+                    [row for _, row in valid_adds],
+                ).scalars().all()
+
+                _adjust_car_counters(connection, [row["user_id"] for _, row in valid_adds], 1)
+
+            if valid_deletes:
+                deleted_ids = [car_id for _, car_id in valid_deletes]
+                services_per_car = dict(
+                    db.session.execute(
+                        select(Service.car_id, func.count(Service.service_id))
+                        .where(Service.car_id.in_(deleted_ids))
+                        .group_by(Service.car_id)
+                    ).all()
+                )
+                db.session.execute(
+                    delete(Service).where(Service.car_id.in_(deleted_ids)),
+                    execution_options={"synchronize_session": False},
+                )
+                db.session.execute(
+                    delete(Car).where(Car.car_id.in_(deleted_ids)),
+                    execution_options={"synchronize_session": False},
+                )
+
+                deleted_services = {}
+                for car_id in deleted_ids:
+                    owner = cars[car_id].user_id
+                    deleted_services[owner] = deleted_services.get(owner, 0) - services_per_car.get(car_id, 0)
+
+                _adjust_car_counters(connection, [cars[car_id].user_id for car_id in deleted_ids], -1)
+                _adjust_counters(connection, SERVICES, "total_services", deleted_services)
+
+            if valid_updates:
+                db.session.execute(
+                    update(Car), [{"car_id": car_id, **row} for _, car_id, row in valid_updates]
+                )
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in apply_cars: {str(e)}")
+            return _failed_summary(results, "Batch write failed.")
+
+        for index, car_id in valid_deletes:
+            results[index] = _ok(index, DELETE_SUCCESS, car_id=car_id)
+        for index, car_id, _ in valid_updates:
+            results[index] = _ok(index, UPDATE_SUCCESS, car_id=car_id)
+        for (index, _), car_id in zip(valid_adds, new_ids):
+            results[index] = _ok(index, ADD_SUCCESS, car_id=car_id)
+
+        return _summary(results)
+
+    @staticmethod
+    def apply_services(operations, owner_id=None):
+        results = [None] * len(operations)
+        adds, updates, deletes = [], [], []
+        seen = set()
+
+        for index, operation in enumerate(operations):
+            try:
+                kind = _operation_kind(operation)
+                if kind == "add":
+                    row = _parse_service_fields(operation, partial=False)
+                    row["car_id"] = _parse_id(operation, "car_id")
+                    adds.append((index, row))
+                else:
+                    service_id = _parse_id(operation, "service_id")
+                    if service_id in seen:
+                        raise ValueError("Service appears more than once in batch.")
+                    seen.add(service_id)
+
+                    if kind == "update":
+                        updates.append((index, service_id, _parse_service_fields(operation, partial=True)))
+                    else:
+                        deletes.append((index, service_id))
+            except ValueError as e:
+                results[index] = _error(index, str(e))
+
+        target_ids = [service_id for _, service_id, _ in updates] + [service_id for _, service_id in deletes]
+        service_owners = dict(
+            db.session.execute(
+                select(Service.service_id, Car.user_id)
+                .join(Car, Service.car_id == Car.car_id)
+                .where(Service.service_id.in_(target_ids))
+            ).all()
+        ) if target_ids else {}
+
+        car_ids = {row["car_id"] for _, row in adds}
+        car_owners = dict(
+            db.session.execute(
+                select(Car.car_id, Car.user_id).where(Car.car_id.in_(car_ids))
+            ).all()
+        ) if car_ids else {}
+
+        def owned(owners, key):
+            owner = owners.get(key)
+            return owner is not None and (owner_id is None or owner == owner_id)
+
+        valid_deletes = []
+        for index, service_id in deletes:
+            if owned(service_owners, service_id):
+                valid_deletes.append((index, service_id))
+            else:
+                results[index] = _error(index, ERROR_SERVICE_NOT_FOUND)
+
+        valid_updates = []
+        for index, service_id, row in updates:
+            if not owned(service_owners, service_id):
+                results[index] = _error(index, ERROR_SERVICE_NOT_FOUND)
+            elif row:
+                valid_updates.append((index, service_id, row))
+            else:
+                results[index] = _ok(index, NO_CHANGES_MADE, service_id=service_id)
+
+        valid_adds = []
+        for index, row in adds:
+            if owned(car_owners, row["car_id"]):
+                valid_adds.append((index, row))
+            else:
+                results[index] = _error(index, ERROR_CAR_NOT_FOUND)
+
+        try:
+            connection = db.session.connection()
+
+            new_ids = []
+            if valid_adds:
+                new_ids = db.session.execute(
+                    insert(Service).returning(Service.service_id, sort_by_parameter_order=True),
+                    [row for _, row in valid_adds],
+                ).scalars().all()
+                _adjust_service_counters(
+                    connection, [car_owners[row["car_id"]] for _, row in valid_adds], 1
+                )
+
+
+            if valid_deletes:
+                deleted_ids = [service_id for _, service_id in valid_deletes]
+                db.session.execute(
+                    delete(Service).where(Service.service_id.in_(deleted_ids)),
+                    execution_options={"synchronize_session": False},
+                )
+                _adjust_service_counters(
+                    connection, [service_owners[service_id] for service_id in deleted_ids], -1
+                )
+
+            if valid_updates:
+                db.session.execute(
+                    update(Service),
+                    [{"service_id": service_id, **row} for _, service_id, row in valid_updates],
+                )
+
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in apply_services: {str(e)}")
+            return _failed_summary(results, "Batch write failed.")
+
+        for index, service_id in valid_deletes:
+            results[index] = _ok(index, DELETE_SUCCESS, service_id=service_id)
+        for index, service_id, _ in valid_updates:
+            results[index] = _ok(index, UPDATE_SUCCESS, service_id=service_id)
+        for (index, _), service_id in zip(valid_adds, new_ids):
+            results[index] = _ok(index, ADD_SUCCESS, service_id=service_id)
+
+        return _summary(results)
+
+
+def _operation_kind(operation):
+    if not isinstance(operation, dict) or operation.get("op") not in BATCH_OPERATIONS:
+        raise ValueError(f"Operation must be one of: {', '.join(BATCH_OPERATIONS)}.")
+    return operation["op"]
+
+
+def _parse_id(operation, key):
+    value = operation.get(key)
+    if value is None and key in ID_ALIASES:
+        value = operation.get(ID_ALIASES[key])
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {key}.")
+
+
+def _check_type(field, value):
+    if field in TEXT_FIELDS and not isinstance(value, str):
+        raise ValueError(f"Invalid {field}, expected a string.")
+    if field in NUMBER_FIELDS and (isinstance(value, bool) or not isinstance(value, (int, float, str))):
+        raise ValueError(f"Invalid {field}, expected a number.")
+
+
+def _parse_car_fields(operation, partial):
+    row = {}
+
+    for field in CAR_FIELDS:
+        value = operation.get(field)
+        if not value:
+            if not partial:
+                raise ValueError(f"Missing {field}.")
+            continue
+        _check_type(field, value)
+        row[field] = value
+
+    if "year" in row:
+        try:
+            row["year"] = int(row["year"])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid year.")
+
+    return row
+
+
+def _parse_service_fields(operation, partial):
+    row = {}
+
+    for field, column in SERVICE_FIELDS.items():
+        value = operation.get(field)
+        if value:
+            _check_type(field, value)
+            row[column] = value
+
+    if not partial:
+        if not row.get("service_type"):
+            raise ValueError("Missing type.")
+        if not row.get("service_date"):
+            raise ValueError("Missing date.")
+        row.setdefault("mileage", 0)
+        row.setdefault("cost", 0)
+        row.setdefault("next_service_date", None)
+        row.setdefault("notes", None)
+
+    try:
+        if "mileage" in row:
+            row["mileage"] = int(row["mileage"])
+        if "cost" in row:
+            row["cost"] = Decimal(str(row["cost"]))
+    except (TypeError, ValueError, InvalidOperation):
+        raise ValueError("Invalid mileage or cost.")
+
+    try:
+        for column in ("service_date", "next_service_date"):
+            if row.get(column):
+                row[column] = datetime.strptime(row[column], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date, expected YYYY-MM-DD.")
+
+    return row
+
+
+def _adjust_car_counters(connection, owners, delta):
+    _adjust_counters(connection, CARS, "total_cars", _per_owner(owners, delta))
+
+
+def _adjust_service_counters(connection, owners, delta):
+    _adjust_counters(connection, SERVICES, "total_services", _per_owner(owners, delta))
+
+
+def _per_owner(owners, delta):
+    changes = {}
+    for owner in owners:
+        changes[owner] = changes.get(owner, 0) + delta
+    return changes
+
+
+def _adjust_counters(connection, name, column, changes):
+    total = sum(changes.values())
+    if total:
+        CounterService.adjust(connection, name, total)
+
+    for owner, delta in changes.items():
+        if delta:
+            CounterService.adjust_user(connection, owner, column, delta)
+
+
+def _ok(index, message, **ids):
+    return {"index": index, "status": "ok", "message": message, **ids}
+
+
+def _error(index, message):
+    return {"index": index, "status": "error", "message": message}
+
+
+def _summary(results):
+    succeeded = sum(1 for result in results if result["status"] == "ok")
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+
+def _failed_summary(results, message):
+    return _summary(
+        [result if result is not None else _error(index, message) for index, result in enumerate(results)]
+    )
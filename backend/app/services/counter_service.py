@@ -0,0 +1,204 @@
+from sqlalchemy import event, func, insert, inspect, select, union, update, delete
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.models.counter import Counter, UserCounter
+from app.models.login_daily import LoginDaily
+from app.models.visitor import VisitorCount
+from app.utils.logging_config import logger
+from app.database.database import db
+from app.services.visitor_service import VisitorService
+
+
+USERS = "users"
+CARS = "cars"
+SERVICES = "services"
+VISITORS = "visitors"
+
+counters = Counter.__table__
+user_counters = UserCounter.__table__
+
+
+class CounterService:
+    @staticmethod
+    def adjust(connection, name, delta):
+        result = connection.execute(
+            update(counters)
+            .where(counters.c.name == name)
+            .values(value=counters.c.value + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(counters).values(name=name, value=max(delta, 0)))
+
+    @staticmethod
+    def adjust_user(connection, user_id, column, delta):
+        result = connection.execute(
+            update(user_counters)
+            .where(user_counters.c.user_id == user_id)
+            .values({column: user_counters.c[column] + delta})
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                insert(user_counters).values(user_id=user_id, **{column: max(delta, 0)})
+            )
+
+    @staticmethod
+    def get(name):
+        try:
+            value = db.session.execute(
+                select(counters.c.value).where(counters.c.name == name)
+            ).scalar()
+            return value or 0
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in get counter '{name}': {str(e)}")
+            return 0
+
+    @staticmethod
+    def get_user(user_id, column):
+        try:
+            value = db.session.execute(
+                select(user_counters.c[column]).where(user_counters.c.user_id == user_id)
+            ).scalar()
+            return value or 0
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in get user counter '{column}': {str(e)}")
+            return 0
+
+    @staticmethod
+    def reconcile():
+        try:
+            CounterService.rebuild(db.session.connection())
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in reconcile counters: {str(e)}")
+            return False
+
+    @staticmethod
+    def rebuild(connection):
+        def total(statement):
+            return connection.execute(statement).scalar()
+
+        # Logins pruned from login_logs live on in the daily rollup table,
+        # which older schema versions do not have yet.
+        has_rollups = inspect(connection).has_table(LoginDaily.__tablename__)
+        visitor_ids = select(LoginLogs.user_id)
+        if has_rollups:
+            visitor_ids = union(visitor_ids, select(LoginDaily.user_id))
+
+        connection.execute(delete(counters))
+        connection.execute(
+            insert(counters),
+            [
+                {"name": USERS, "value": total(select(func.count(User.user_id)))},
+                {"name": CARS, "value": total(select(func.count(Car.car_id)))},
+                {"name": SERVICES, "value": total(select(func.count(Service.service_id)))},
+                {
+                    "name": VISITORS,
+                    "value": total(select(func.count()).select_from(visitor_ids.subquery())),
+                },
+            ],
+        )
+
+        total_cars = (
+            select(func.count(Car.car_id))
+            .where(Car.user_id == User.user_id)
+            .scalar_subquery()
+        )
+        total_services = (
+            select(func.count(Service.service_id))
+            .join(Car, Service.car_id == Car.car_id)
+            .where(Car.user_id == User.user_id)
+            .scalar_subquery()
+        )
+        total_logins = (
+            select(func.count(LoginLogs.log_id))
+            .where(LoginLogs.user_id == User.user_id)
+            .scalar_subquery()
+        )
+        if has_rollups:
+            rolled_up_logins = (
+                select(func.coalesce(func.sum(LoginDaily.logins), 0))
+                .where(LoginDaily.user_id == User.user_id)
+                .scalar_subquery()
+            )
+            total_logins = total_logins + rolled_up_logins
+
+        connection.execute(delete(user_counters))
+        connection.execute(
+            insert(user_counters).from_select(
+                ["user_id", "total_cars", "total_services", "total_logins"],
+                select(User.user_id, total_cars, total_services, total_logins),
+            )
+        )
+
+        if inspect(connection).has_table(VisitorCount.__tablename__):
+            VisitorService.rebuild(connection)
+
+
+def _car_owner(connection, car_id):
+    return connection.execute(select(Car.user_id).where(Car.car_id == car_id)).scalar()
+
+
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, target):
+    CounterService.adjust(connection, USERS, 1)
+    CounterService.adjust_user(connection, target.user_id, "total_cars", 0)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    CounterService.adjust(connection, USERS, -1)
+    connection.execute(delete(user_counters).where(user_counters.c.user_id == target.user_id))
+
+
+@event.listens_for(Car, "after_insert")
+def _car_inserted(mapper, connection, target):
+    CounterService.adjust(connection, CARS, 1)
+    CounterService.adjust_user(connection, target.user_id, "total_cars", 1)
+
+
+@event.listens_for(Car, "after_delete")
+def _car_deleted(mapper, connection, target):
+    CounterService.adjust(connection, CARS, -1)
+    CounterService.adjust_user(connection, target.user_id, "total_cars", -1)
+
+
+@event.listens_for(Service, "after_insert")
+def _service_inserted(mapper, connection, target):
+    CounterService.adjust(connection, SERVICES, 1)
+    owner_id = _car_owner(connection, target.car_id)
+    if owner_id is not None:
+        CounterService.adjust_user(connection, owner_id, "total_services", 1)
+
+
+@event.listens_for(Service, "after_delete")
+def _service_deleted(mapper, connection, target):
+    CounterService.adjust(connection, SERVICES, -1)
+    owner_id = _car_owner(connection, target.car_id)
+    if owner_id is not None:
+        CounterService.adjust_user(connection, owner_id, "total_services", -1)
+
+
+@event.listens_for(LoginLogs, "after_insert")
+def _login_inserted(mapper, connection, target):
+    CounterService.adjust_user(connection, target.user_id, "total_logins", 1)
+    if _user_logins(connection, target.user_id) == 1:
+        CounterService.adjust(connection, VISITORS, 1)
+
+
+@event.listens_for(LoginLogs, "after_delete")
+def _login_deleted(mapper, connection, target):
+    CounterService.adjust_user(connection, target.user_id, "total_logins", -1)
+    if _user_logins(connection, target.user_id) == 0:
+        CounterService.adjust(connection, VISITORS, -1)
+
+
+def _user_logins(connection, user_id):
+    return connection.execute(
+        select(user_counters.c.total_logins).where(user_counters.c.user_id == user_id)
+    ).scalar()
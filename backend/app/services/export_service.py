@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import select
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.utils.constants import ERROR_EXPORT_INCOMPLETE
+from app.utils.logging_config import logger
+from app.database.database import db
+
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_FIELDS = {
+    "cars": ["car_id", "user_id", "name", "model", "year", "vin"],
+    "services": [
+        "service_id",
+        "car_id",
+        "mileage",
+        "service_type",
+        "service_date",
+        "next_service_date",
+        "cost",
+        "notes",
+    ],
+    "login_logs": ["log_id", "user_id", "login_time", "logout_time", "ip_address"],
+}
+
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ExportService:
+    @staticmethod
+    def build_query(kind, user_id=None, date_from=None, date_to=None):
+        if kind == "cars":
+            query = select(Car).order_by(Car.car_id)
+            if user_id is not None:
+                query = query.where(Car.user_id == user_id)
+            return query
+
+        if kind == "services":
+            query = select(Service).order_by(Service.service_id)
+            if user_id is not None:
+                query = query.join(Car, Service.car_id == Car.car_id).where(
+                    Car.user_id == user_id
+                )
+            if date_from is not None:
+                query = query.where(Service.service_date >= date_from)
+            if date_to is not None:
+                query = query.where(Service.service_date <= date_to)
+            return query
+
+        query = select(LoginLogs).order_by(LoginLogs.log_id)
+        if user_id is not None:
+            query = query.where(LoginLogs.user_id == user_id)
+        if date_from is not None:
+            query = query.where(LoginLogs.login_time >= datetime.combine(date_from, time.min))
+        if date_to is not None:
+            query = query.where(
+                LoginLogs.login_time < datetime.combine(date_to + timedelta(days=1), time.min)
+            )
+        return query
+
+    # The 200 status and headers are sent before the first row, so a failure
+    # mid-stream cannot change the status. Instead the stream ends with an
+    # error record: {"error": ...} for NDJSON, a "#error" row for CSV.
+    @staticmethod
+    def stream(kind, format_name, chunk_size=1000, **filters):
+        query = ExportService.build_query(kind, **filters).execution_options(
+            yield_per=chunk_size
+        )
+        fields = EXPORT_FIELDS[kind]
+
+        try:
+            records = db.session.execute(query).scalars()
+
+            if format_name == "csv":
+                yield from _csv_chunks(records, fields, chunk_size)
+            else:
+                yield from _ndjson_chunks(records, chunk_size)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in export {kind}, stream ended with an error record: {str(e)}")
+            yield _error_record(format_name)
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _error_record(format_name):
+    if format_name == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(["#error", ERROR_EXPORT_INCOMPLETE])
+        return buffer.getvalue()
+    return json.dumps({"error": ERROR_EXPORT_INCOMPLETE}) + "\n"
+
+
+def _ndjson_chunks(records, chunk_size):
+    lines = []
+    for record in records:
+        row = {key: _plain(value) for key, value in record.to_dict().items()}
+        lines.append(json.dumps(row))
+
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(records, fields, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    pending = 0
+
+    for record in records:
+        row = record.to_dict()
+        writer.writerow([_plain(row[field]) for field in fields])
+        pending += 1
+
+        if pending >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    yield buffer.getvalue()
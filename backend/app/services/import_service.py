@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from sqlalchemy import insert, select
+from app.models.car import Car
+from app.models.service import Service
+from app.utils.logging_config import logger
+from app.database.database import db
+from app.services.counter_service import CounterService, SERVICES
+from app.utils.constants import ERROR_CAR_NOT_FOUND, ERROR_INVALID_IMPORT_ENCODING
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Stands in for a row whose bytes were not valid UTF-8.
+_BAD_ENCODING = object()
+
+
+class ImportService:
+    @staticmethod
+    def detect_format(format_name=None, content_type=None):
+        if format_name:
+            return format_name if format_name in IMPORT_FORMATS else None
+
+        content_type = (content_type or "").split(";")[0].strip()
+        if content_type in ("text/csv", "application/csv"):
+            return "csv"
+        if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            return "ndjson"
+
+        return None
+
+    @staticmethod
+    def import_services(text_stream, format_name, owner_id=None, batch_size=1000, max_errors=100):
+        records = _read_csv(text_stream) if format_name == "csv" else _read_ndjson(text_stream)
+        summary = {"inserted": 0, "failed": 0, "errors": []}
+
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+
+            rows, errors = _validate_batch(batch, owner_id)
+
+            try:
+                if rows:
+                    _insert_batch(rows)
+                db.session.commit()
+                summary["inserted"] += len(rows)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error in import_services: {str(e)}")
+                errors.extend((line, "Batch insert failed.") for line, _, _ in rows)
+
+            summary["failed"] += len(errors)
+            for line, message in sorted(errors):
+                if len(summary["errors"]) < max_errors:
+                    summary["errors"].append({"line": line, "message": message})
+
+        return summary
+
+
+def _is_valid_utf8(text):
+    # open_text_stream decodes with surrogateescape, which keeps invalid
+    # bytes as lone surrogates that cannot be encoded back.
+    try:
+        text.encode("utf-8")
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def _read_csv(text_stream):
+    reader = csv.DictReader(text_stream)
+    for record in reader:
+        values = [value for value in record.values() if isinstance(value, str)]
+        values.extend(value for value in record.get(None) or [] if isinstance(value, str))
+        if not all(_is_valid_utf8(value) for value in values):
+            record = _BAD_ENCODING
+        yield reader.line_num, record
+
+
+def _read_ndjson(text_stream):
+    for line_number, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        if not _is_valid_utf8(line):
+            yield line_number, _BAD_ENCODING
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record
+
+
+def _parse_record(record):
+    if record is _BAD_ENCODING:
+        raise ValueError(ERROR_INVALID_IMPORT_ENCODING)
+
+    if not isinstance(record, dict):
+        raise ValueError("Malformed record.")
+
+    service_type = record.get("service_type")
+    if not service_type:
+        raise ValueError("Missing service_type.")
+
+    if not record.get("service_date"):
+        raise ValueError("Missing service_date.")
+
+    try:
+        car_id = int(record.get("car_id"))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid car_id.")
+
+    try:
+        mileage = int(record.get("mileage") or 0)
+        cost = Decimal(str(record.get("cost") or 0))
+    except (TypeError, ValueError, InvalidOperation):
+        raise ValueError("Invalid mileage or cost.")
+
+    try:
+        service_date = datetime.strptime(record["service_date"], "%Y-%m-%d").date()
+        next_service_date = (
+            datetime.strptime(record["next_service_date"], "%Y-%m-%d").date()
+            if record.get("next_service_date")
+            else None
+        )
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date, expected YYYY-MM-DD.")
+
+    return {
+        "car_id": car_id,
+        "mileage": mileage,
+        "service_type": service_type,
+        "service_date": service_date,
+        "next_service_date": next_service_date,
+        "cost": cost,
+        "notes": record.get("notes") or None,
+    }
+
+
+def _validate_batch(batch, owner_id):
+    parsed = []
+    errors = []
+
+    for line, record in batch:
+        try:
+            parsed.append((line, _parse_record(record)))
+        except ValueError as e:
+            errors.append((line, str(e)))
+
+    car_ids = {row["car_id"] for _, row in parsed}
+    owners = {}
+    if car_ids:
+        owners = dict(
+            db.session.execute(
+                select(Car.car_id, Car.user_id).where(Car.car_id.in_(car_ids))
+            ).all()
+        )
+
+    rows = []
+    for line, row in parsed:
+        car_owner = owners.get(row["car_id"])
+        if car_owner is None or (owner_id is not None and car_owner != owner_id):
+            errors.append((line, ERROR_CAR_NOT_FOUND))
+        else:
+            rows.append((line, row, car_owner))
+
+    return rows, errors
+
+
+def _insert_batch(rows):
+    db.session.execute(insert(Service), [row for _, row, _ in rows])
+
+    connection = db.session.connection()
+    CounterService.adjust(connection, SERVICES, len(rows))
+
+    per_owner = {}
+    for _, _, car_owner in rows:
+        per_owner[car_owner] = per_owner.get(car_owner, 0) + 1
+    for car_owner, inserted in per_owner.items():
+        CounterService.adjust_user(connection, car_owner, "total_services", inserted)
+
+
+def open_text_stream(binary_stream):
+    return io.TextIOWrapper(io.BufferedReader(binary_stream), encoding="utf-8", errors="surrogateescape", newline="")
@@ -0,0 +1,82 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from bcrypt import gensalt, hashpw
+from sqlalchemy import bindparam, func, select, update
+from app.models.user import User
+from app.utils.logging_config import logger
+from app.database.database import db
+
+
+users = User.__table__
+
+# Matches is_password_plaintext: bcrypt hashes are always 60 characters.
+_plaintext = func.length(users.c.password) < 60
+
+
+def _hash_plaintext(password, rounds):
+    return hashpw(password.encode("utf-8"), gensalt(rounds=rounds)).decode("utf-8")
+
+
+class PasswordMigration:
+    @staticmethod
+    def remaining():
+        return db.session.execute(
+            select(func.count()).select_from(users).where(_plaintext)
+        ).scalar_one()
+
+    @staticmethod
+    def migrate_plaintext(rounds, chunk_size=500, processes=None):
+        summary = {"hashed": 0, "skipped": 0}
+        processes = processes or os.cpu_count() or 1
+        last_id = 0
+        statement = (
+            update(users)
+            .where(
+                users.c.user_id == bindparam("b_user_id"),
+                users.c.password == bindparam("b_plaintext"),
+            )
+            .values(password=bindparam("b_hashed"))
+        )
+
+        try:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                while True:
+                    rows = db.session.execute(
+                        select(users.c.user_id, users.c.password)
+                        .where(_plaintext, users.c.user_id > last_id)
+                        .order_by(users.c.user_id)
+                        .limit(chunk_size)
+                    ).all()
+
+                    if not rows:
+                        break
+
+                    plaintexts = [row.password for row in rows]
+                    hashes = executor.map(
+                        _hash_plaintext,
+                        plaintexts,
+                        repeat(rounds),
+                        chunksize=max(1, len(rows) // (processes * 4)),
+                    )
+
+                    result = db.session.execute(
+                        statement,
+                        [
+                            {"b_user_id": row.user_id, "b_plaintext": row.password, "b_hashed": hashed}
+                            for row, hashed in zip(rows, hashes)
+                        ],
+                    )
+                    db.session.commit()
+
+                    # Rows whose password changed since the scan are left alone.
+                    summary["hashed"] += result.rowcount
+                    summary["skipped"] += len(rows) - result.rowcount
+                    last_id = rows[-1].user_id
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in migrate_plaintext: {str(e)}")
+            return None
+
+        summary["remaining"] = PasswordMigration.remaining()
+        return summary
@@ -0,0 +1,205 @@
+import threading
+from flask import current_app
+from sqlalchemy import delete, exists, func, select, update
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.models.login_daily import LoginDaily
+from app.models.counter import UserCounter
+from app.utils.logging_config import logger
+from app.database.database import db
+from app.database.sqlite_profile import run_with_retry
+from app.services.counter_service import CounterService, USERS, CARS, SERVICES, VISITORS
+from app.services.visitor_service import VisitorService
+
+
+_purges = set()
+_purges_lock = threading.Lock()
+
+
+class PurgeService:
+    @staticmethod
+    def delete_car(car_id, owner_id=None):
+        car = db.session.execute(
+            select(Car.car_id, Car.user_id).where(Car.car_id == car_id)
+        ).first()
+        if car is None or (owner_id is not None and car.user_id != owner_id):
+            return False
+
+        connection = db.session.connection()
+        removed = _delete_chunk(Service, Service.service_id, Service.car_id == car_id)
+        _delete_chunk(Car, Car.car_id, Car.car_id == car_id)
+
+        CounterService.adjust(connection, CARS, -1)
+        CounterService.adjust_user(connection, car.user_id, "total_cars", -1)
+        if removed:
+            CounterService.adjust(connection, SERVICES, -removed)
+            CounterService.adjust_user(connection, car.user_id, "total_services", -removed)
+
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def account_size(user_id):
+        services = db.session.execute(
+            select(func.count(Service.service_id)).where(_owned_services(user_id))
+        ).scalar()
+        logs = db.session.execute(
+            select(func.count(LoginLogs.log_id)).where(LoginLogs.user_id == user_id)
+        ).scalar()
+        return services + logs
+
+    @staticmethod
+    def delete_user(user_id):
+        _purge_user(user_id, chunk_size=None)
+
+    @staticmethod
+    def purge_user(user_id, chunk_size):
+        _purge_user(user_id, chunk_size)
+
+    @staticmethod
+    def schedule_purge(user_id):
+        with _purges_lock:
+            if user_id in _purges:
+                return False
+            _purges.add(user_id)
+
+        # Lock the account so it cannot log in while its rows are removed.
+        db.session.execute(update(User).where(User.user_id == user_id).values(locked=True))
+        db.session.commit()
+
+        app = current_app._get_current_object()
+        threading.Thread(
+            target=_run_purge,
+            args=(app, user_id, app.config.get("PURGE_CHUNK_SIZE", 1000)),
+            name=f"purge-user-{user_id}",
+            daemon=True,
+        ).start()
+        return True
+
+    @staticmethod
+    def in_progress():
+        with _purges_lock:
+            return sorted(_purges)
+
+
+def _owned_services(user_id):
+    return Service.car_id.in_(select(Car.car_id).where(Car.user_id == user_id))
+
+
+def _delete_chunk(model, key, condition, chunk_size=None):
+    if chunk_size is not None:
+        condition = key.in_(select(key).where(condition).limit(chunk_size))
+
+    result = db.session.execute(
+        delete(model).where(condition), execution_options={"synchronize_session": False}
+    )
+    return result.rowcount
+
+
+def _purge_user(user_id, chunk_size):
+    # Children go first so the deletes succeed with foreign keys enforced,
+    # and so that an interrupted chunked purge can simply be re-run.
+    steps = (_purge_services, _purge_cars, _purge_logins, _purge_rollups, _purge_visits, _purge_account)
+
+    if chunk_size is None:
+        def purge_all():
+            for step in steps:
+                step(user_id, None)
+            db.session.commit()
+
+        run_with_retry(purge_all)
+        return
+
+    for step in steps:
+        def purge_chunk():
+            removed = step(user_id, chunk_size)
+            db.session.commit()
+            return removed
+
+        while run_with_retry(purge_chunk):
+            pass
+
+
+def _purge_services(user_id, chunk_size):
+    removed = _delete_chunk(Service, Service.service_id, _owned_services(user_id), chunk_size)
+    if removed:
+        connection = db.session.connection()
+        CounterService.adjust(connection, SERVICES, -removed)
+        CounterService.adjust_user(connection, user_id, "total_services", -removed)
+    return removed
+
+
+def _purge_cars(user_id, chunk_size):
+    removed = _delete_chunk(Car, Car.car_id, Car.user_id == user_id, chunk_size)
+    if removed:
+        connection = db.session.connection()
+        CounterService.adjust(connection, CARS, -removed)
+        CounterService.adjust_user(connection, user_id, "total_cars", -removed)
+    return removed
+
+
+def _purge_logins(user_id, chunk_size):
+    removed = _delete_chunk(LoginLogs, LoginLogs.log_id, LoginLogs.user_id == user_id, chunk_size)
+    if removed:
+        connection = db.session.connection()
+        CounterService.adjust_user(connection, user_id, "total_logins", -removed)
+        if not _has_logins(user_id):
+            CounterService.adjust(connection, VISITORS, -1)
+    return removed
+
+
+def _purge_rollups(user_id, chunk_size):
+    if chunk_size is not None:
+        days = select(LoginDaily.day).where(LoginDaily.user_id == user_id).limit(chunk_size)
+        condition = (LoginDaily.user_id == user_id) & LoginDaily.day.in_(days.scalar_subquery())
+    else:
+        condition = LoginDaily.user_id == user_id
+
+    logins = db.session.execute(select(func.sum(LoginDaily.logins)).where(condition)).scalar()
+    removed = db.session.execute(
+        delete(LoginDaily).where(condition), execution_options={"synchronize_session": False}
+    ).rowcount
+    if removed:
+        connection = db.session.connection()
+        CounterService.adjust_user(connection, user_id, "total_logins", -(logins or 0))
+        if not _has_logins(user_id):
+            CounterService.adjust(connection, VISITORS, -1)
+    return removed
+
+
+def _has_logins(user_id):
+    return db.session.execute(
+        select(
+            exists().where(LoginLogs.user_id == user_id)
+            | exists().where(LoginDaily.user_id == user_id)
+        )
+    ).scalar()
+
+
+def _purge_visits(user_id, chunk_size):
+    return VisitorService.forget_user(db.session.connection(), user_id)
+
+
+def _purge_account(user_id, chunk_size):
+    removed = _delete_chunk(User, User.user_id, User.user_id == user_id)
+    if removed:
+        connection = db.session.connection()
+        CounterService.adjust(connection, USERS, -1)
+        connection.execute(delete(UserCounter.__table__).where(UserCounter.user_id == user_id))
+    return removed
+
+
+def _run_purge(app, user_id, chunk_size):
+    with app.app_context():
+        try:
+            PurgeService.purge_user(user_id, chunk_size)
+            logger.info(f"Purged user {user_id}")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in purge_user {user_id}: {str(e)}")
+        finally:
+            db.session.remove()
+            with _purges_lock:
+                _purges.discard(user_id)
@@ -0,0 +1,80 @@
+from datetime import datetime, time, timedelta, timezone
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.login_logs import LoginLogs
+from app.models.login_daily import LoginDaily
+from app.utils.logging_config import logger
+from app.database.database import db
+from app.database.sqlite_profile import run_with_retry
+
+
+class RetentionService:
+    @staticmethod
+    def prune_before(cutoff, chunk_size=1000):
+        condition = LoginLogs.login_time < cutoff
+        pruned = 0
+
+        try:
+            while True:
+                removed = run_with_retry(lambda: _rollup_and_delete(condition, chunk_size))
+                if not removed:
+                    break
+                pruned += removed
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in prune_before: {str(e)}")
+            return None
+
+        return pruned
+
+    @staticmethod
+    def prune_range(date_from=None, date_to=None):
+        conditions = []
+        if date_from:
+            conditions.append(LoginLogs.login_time >= datetime.combine(date_from, time.min))
+        if date_to:
+            conditions.append(LoginLogs.login_time < datetime.combine(date_to + timedelta(days=1), time.min))
+
+        try:
+            return run_with_retry(lambda: _rollup_and_delete(and_(*conditions), None))
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in prune_range: {str(e)}")
+            return None
+
+    @staticmethod
+    def retention_cutoff(days):
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        return datetime.combine(cutoff.date(), time.min)
+
+
+def _rollup_and_delete(condition, chunk_size):
+    if chunk_size is not None:
+        chunk = (
+            select(LoginLogs.log_id)
+            .where(condition)
+            .order_by(LoginLogs.login_time, LoginLogs.log_id)
+            .limit(chunk_size)
+        )
+        condition = LoginLogs.log_id.in_(chunk.scalar_subquery())
+
+    day = func.date(LoginLogs.login_time)
+    rollup = sqlite_insert(LoginDaily).from_select(
+        ["user_id", "day", "logins"],
+        select(LoginLogs.user_id, day, func.count(LoginLogs.log_id))
+        .where(condition)
+        .group_by(LoginLogs.user_id, day),
+    )
+    db.session.execute(
+        rollup.on_conflict_do_update(
+            index_elements=[LoginDaily.user_id, LoginDaily.day],
+            set_={"logins": LoginDaily.logins + rollup.excluded.logins},
+        )
+    )
+
+    # Logins move to the rollup table, so the login counters stay as they are.
+    removed = db.session.execute(
+        delete(LoginLogs).where(condition), execution_options={"synchronize_session": False}
+    ).rowcount
+    db.session.commit()
+    return removed
@@ -0,0 +1,120 @@
+import re
+import sqlite3
+from flask import current_app
+from sqlalchemy import Integer, column, inspect, text
+from app.utils.logging_config import logger
+from app.database.database import db
+
+
+FTS_TABLES = {
+    "users_fts": ("users", "user_id", ["username", "email", "role"]),
+    "cars_fts": ("cars", "car_id", ["name", "model", "year", "vin"]),
+    "services_fts": (
+        "services",
+        "service_id",
+        ["service_type", "mileage", "cost", "service_date"],
+    ),
+}
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+_enabled = False
+
+# The trigram tokenizer matches substrings (e.g. the tail of a VIN) but
+# cannot match terms shorter than three characters; those searches use LIKE.
+TRIGRAM_AVAILABLE = sqlite3.sqlite_version_info >= (3, 34, 0)
+MIN_TERM_LENGTH = 3
+
+
+class SearchIndex:
+    @staticmethod
+    def enabled():
+        global _enabled
+        if current_app.config.get("SEARCH_BACKEND", "fts") != "fts":
+            return False
+        if _enabled:
+            return True
+
+        try:
+            if db.engine.dialect.name != "sqlite":
+                return False
+            inspector = inspect(db.engine)
+            _enabled = all(inspector.has_table(name) for name in FTS_TABLES)
+        except Exception as e:
+            logger.error(f"Error checking search index: {str(e)}")
+
+        return _enabled
+
+    @staticmethod
+    def match_expression(query):
+        terms = _TERM_PATTERN.findall(query or "")
+        if not terms or any(len(term) < MIN_TERM_LENGTH for term in terms):
+            return ""
+        return " ".join(f'"{term}"' for term in terms)
+
+    @staticmethod
+    def matching_ids(fts_table, expression):
+        return text(
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :expression"
+        ).bindparams(expression=expression).columns(column("rowid", Integer))
+
+    @staticmethod
+    def create_tables(connection):
+        if not TRIGRAM_AVAILABLE:
+            return
+
+        existing = set(inspect(connection).get_table_names())
+
+        for fts_table in FTS_TABLES:
+            if fts_table not in existing:
+                for statement in _ddl(fts_table):
+                    connection.exec_driver_sql(statement)
+
+    @staticmethod
+    def drop_tables(connection):
+        for fts_table, (table, _, _) in FTS_TABLES.items():
+            for suffix in ("ai", "ad", "au"):
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {fts_table}")
+
+    @staticmethod
+    def rebuild(connection):
+        for fts_table in FTS_TABLES:
+            connection.exec_driver_sql(
+                f"INSERT INTO {fts_table}({fts_table}) VALUES('rebuild')"
+            )
+
+    @staticmethod
+    def reindex():
+        try:
+            SearchIndex.rebuild(db.session.connection())
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in rebuild search index: {str(e)}")
+            return False
+
+
+def _ddl(fts_table):
+    table, key, columns = FTS_TABLES[fts_table]
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{name}" for name in columns)
+    old_values = ", ".join(f"old.{name}" for name in columns)
+
+    insert_new = (
+        f"INSERT INTO {fts_table}(rowid, {column_list}) "
+        f"VALUES (new.{key}, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.{key}, {old_values});"
+    )
+
+    return [
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='{key}', tokenize='trigram')",
+        f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
@@ -7,6 +7,13 @@ from app.models.service import Service
 from app.utils.logging_config import logger
 from app.database.database import db
 from app.utils.auth_utils import hash_password
+from app.utils.password_hasher import PasswordHasherBusy
+from app.utils.principal_cache import principal_cache
+from app.utils.token_epochs import token_epochs
+from app.utils.pagination import InvalidCursor, keyset_paginate, paginate_query
+from app.services.counter_service import CounterService
+from app.services.search_index import SearchIndex
+from app.services.purge_service import PurgeService
 from app.utils.validation import validate_email, validate_username, validate_vin
 from app.utils.constants import (
     ADD_SUCCESS,
@@ -14,6 +21,7 @@ from app.utils.constants import (
     DELETE_SUCCESS,
     ERROR_CAR_NOT_FOUND,
     ERROR_USER_NOT_FOUND,
+    ERROR_SERVER_BUSY,
     ERROR_NO_CARS_FOUND,
     ERROR_SERVICE_NOT_FOUND,
     ERROR_NO_SERVICES_FOUND,
@@ -40,6 +48,8 @@ class UserService:
                 return {"message": ERROR_USER_NOT_FOUND}
             
             updated = False
+            revoke_tokens = False
+            old_username = user.username
 
             if username and username != user.username:
                 username_error = validate_username(username)
@@ -58,38 +68,52 @@ class UserService:
             if password:
                 user.password = hash_password(password)
                 updated = True
+                revoke_tokens = True
 
             if updated:
                 db.session.commit()
+                principal_cache.invalidate(old_username)
+                if revoke_tokens:
+                    token_epochs.bump(user.user_id)
                 return {"message": UPDATE_SUCCESS}
             else:
                 return {"message": NO_CHANGES_MADE}
 
+        except PasswordHasherBusy:
+            db.session.rollback()
+            logger.warning("Password hashing queue full in update_profile")
+            return {"message": ERROR_SERVER_BUSY}
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error in update_profile: {str(e)}")
             return {"message": "An unexpected error occurred while updating the profile."}
 
     @staticmethod
-    def get_cars_for_user(current_user, page=1, per_page=10):
+    def get_cars_for_user(current_user, page=1, per_page=10, cursor=None, count="exact"):
         try:
-            pagination = Car.query.filter_by(user_id=current_user.user_id).paginate(
-                page=page, per_page=per_page, error_out=False
+            query = db.session.query(
+                Car.car_id, Car.user_id, Car.name, Car.model, Car.year, Car.vin
+            ).filter(Car.user_id == current_user.user_id)
+
+            def to_car_list(rows):
+                return [row._asdict() for row in rows]
+
+            if cursor is not None:
+                keyset = keyset_paginate(
+                    query, [Car.car_id], cursor, per_page, key=lambda row: [row.car_id]
+                )
+                return {
+                    "cars": to_car_list(keyset.items),
+                    "next_cursor": keyset.next_cursor,
+                    "per_page": keyset.per_page,
+                }
+
+            pagination = paginate_query(
+                query.order_by(Car.car_id), page, per_page, count
             )
             
             if pagination.items:
-                car_list = []
-                for car in pagination.items:
-                    car_list.append(
-                        {
-                            "car_id": car.car_id,
-                            "user_id": car.user_id,
-                            "name": car.name,
-                            "model": car.model,
-                            "year": car.year,
-                            "vin": car.vin,
-                        }
-                    )
+                car_list = to_car_list(pagination.items)
 
                 result = {
                         "cars": car_list,
@@ -97,12 +121,15 @@ class UserService:
                         "total_pages": pagination.pages,
                         "current_page": pagination.page,
                         "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
                 return result
             else:
                 logger.warning(ERROR_NO_CARS_FOUND)
                 return []
 
+        except InvalidCursor:
+            raise
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error in get_cars_for_user: {str(e)}")
@@ -112,6 +139,7 @@ class UserService:
                 "total_pages": 0,
                 "current_page": page,
                 "per_page": per_page,
+                "has_next": False,
             }
 
     @staticmethod
@@ -197,14 +225,10 @@ class UserService:
     @staticmethod
     def delete_car(car_id):
         try:
-            car = Car.query.get(car_id)
-            if not car:
+            if not PurgeService.delete_car(car_id):
                 logger.warning(ERROR_CAR_NOT_FOUND)
                 return {"message": ERROR_CAR_NOT_FOUND}
-            
-            db.session.delete(car)
-            db.session.commit()
-            
+
             return {"message": DELETE_SUCCESS}
         except Exception as e:
             db.session.rollback()
@@ -212,28 +236,46 @@ class UserService:
             return {"message": "An unexpected error occurred."}
 
     @staticmethod
-    def get_services_for_car(car_id, page=1, per_page=10):
+    def get_services_for_car(car_id, page=1, per_page=10, cursor=None, count="exact"):
         try:
-            pagination = db.session.query(Service, Car.name.label("car_name")).join(Car).filter(Car.car_id == car_id).paginate(
-                page=page, per_page=per_page, error_out=False
+            query = db.session.query(Service, Car.name.label("car_name")).join(Car).filter(Car.car_id == car_id)
+
+            def to_service_list(rows):
+                return [
+                    {
+                        "service_id": service.service_id,
+                        "car_id": service.car_id,
+                        "car_name": car_name,
+                        "mileage": service.mileage,
+                        "service_type": service.service_type,
+                        "service_date": service.service_date,
+                        "next_service_date": service.next_service_date,
+                        "cost": service.cost,
+                        "notes": service.notes,
+                    }
+                    for service, car_name in rows
+                ]
+
+            if cursor is not None:
+                keyset = keyset_paginate(
+                    query,
+                    [Service.service_id],
+                    cursor,
+                    per_page,
+                    key=lambda row: [row[0].service_id],
+                )
+                return {
+                    "services": to_service_list(keyset.items),
+                    "next_cursor": keyset.next_cursor,
+                    "per_page": keyset.per_page,
+                }
+
+            pagination = paginate_query(
+                query.order_by(Service.service_id), page, per_page, count
             )
             
             if pagination.items:
-                service_list = []
-                for service, car_name in pagination.items:
-                    service_list.append(
-                        {
-                            "service_id": service.service_id,
-                            "car_id": service.car_id,
-                            "car_name": car_name,
-                            "mileage": service.mileage,
-                            "service_type": service.service_type,
-                            "service_date": service.service_date,
-                            "next_service_date": service.next_service_date,
-                            "cost": service.cost,
-                            "notes": service.notes,
-                        }
-                    )
+                service_list = to_service_list(pagination.items)
 
                 result = {
                     "services": service_list,
@@ -241,18 +283,22 @@ class UserService:
                     "total_pages": pagination.pages,
                     "current_page": pagination.page,
                     "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
                 return result
             else:
                 logger.warning(ERROR_NO_SERVICES_FOUND)
                 return {
                     "services": [],
-                    "total_services": 0,
-                    "total_pages": 0,
-                    "current_page": page,
-                    "per_page": per_page,
+                    "total_services": pagination.total,
+                    "total_pages": pagination.pages,
+                    "current_page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "has_next": pagination.has_next,
                 }
 
+        except InvalidCursor:
+            raise
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error in get_services_for_car: {str(e)}")
@@ -262,6 +308,7 @@ class UserService:
                     "total_pages": 0,
                     "current_page": page,
                     "per_page": per_page,
+                    "has_next": False,
                 }
 
     @staticmethod
@@ -353,51 +400,56 @@ class UserService:
 
     @staticmethod
     def get_total_cars(current_user):
-        try:
-            return Car.query.filter_by(user_id=current_user.user_id).count()
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error in get_total_cars: {str(e)}")
-            return 0
+        return CounterService.get_user(current_user.user_id, "total_cars")
 
     @staticmethod
     def get_total_services(current_user):
-        try:
-            return (
-                db.session.query(Service)
-                .join(Car)
-                .filter(Car.user_id == current_user.user_id)
-                .count()
-            )
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error in get_total_services: {str(e)}")
-            return 0
+        return CounterService.get_user(current_user.user_id, "total_services")
 
     @staticmethod
-    def search(current_user, query, page=1, per_page=10):
+    def search(current_user, query, page=1, per_page=10, count="exact"):
         if not query:
             return {"cars": [], "services": []}
         try:
-            cars = Car.query.filter(
-                Car.user_id == current_user.user_id,
-                or_(
+            expression = SearchIndex.match_expression(query) if SearchIndex.enabled() else ""
+            if expression:
+                car_filter = Car.car_id.in_(
+                    SearchIndex.matching_ids("cars_fts", expression)
+                )
+                service_filter = Service.service_id.in_(
+                    SearchIndex.matching_ids("services_fts", expression)
+                )
+            else:
+                car_filter = or_(
                     Car.name.contains(query),
                     Car.model.contains(query),
                     Car.year.contains(query),
                     Car.vin.contains(query),
                 )
-            ).paginate(page=page, per_page=per_page, error_out=False)
-
-            services = Service.query.filter(
-                Service.car.has(Car.user_id == current_user.user_id), 
-                or_(
+                service_filter = or_(
                     Service.mileage.contains(query),
                     Service.service_type.contains(query),
                     cast(Service.service_date, String).contains(query), 
                     Service.cost.contains(query),
                 )
-            ).paginate(page=page, per_page=per_page, error_out=False)
+
+            cars = paginate_query(
+                Car.query.filter(
+                    Car.user_id == current_user.user_id, car_filter
+                ).order_by(Car.car_id),
+                page,
+                per_page,
+                count,
+            )
+
+            services = paginate_query(
+                Service.query.filter(
+                    Service.car.has(Car.user_id == current_user.user_id), service_filter
+                ).order_by(Service.service_id),
+                page,
+                per_page,
+                count,
+            )
 
             return {
                 "cars": {
@@ -405,12 +457,14 @@ class UserService:
                     "total": cars.total,
                     "total_pages": cars.pages,
                     "current_page": cars.page,
+                    "has_next": cars.has_next,
                 },
                 "services": {
                     "data": [service.to_dict() for service in services.items],
                     "total": services.total,
                     "total_pages": services.pages,
                     "current_page": services.page,
+                    "has_next": services.has_next,
                 },
             }
 
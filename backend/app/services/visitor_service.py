@@ -0,0 +1,194 @@
+from datetime import datetime, time, timedelta, timezone
+from sqlalchemy import String, delete, event, exists, func, insert, inspect, literal, select, tuple_, union, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.login_logs import LoginLogs
+from app.models.login_daily import LoginDaily
+from app.models.visitor import VisitorCount, VisitorPeriod
+from app.utils.logging_config import logger
+from app.database.database import db
+
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+PERIODS = (DAY, WEEK, MONTH)
+MAX_TREND_PERIODS = 366
+
+visitor_periods = VisitorPeriod.__table__
+visitor_counts = VisitorCount.__table__
+
+
+class VisitorService:
+    @staticmethod
+    def period_start(period, when):
+        day = when.date() if isinstance(when, datetime) else when
+        if period == WEEK:
+            return day - timedelta(days=day.weekday())
+        if period == MONTH:
+            return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def record(connection, user_id, when):
+        for period in PERIODS:
+            start = VisitorService.period_start(period, when)
+            result = connection.execute(
+                sqlite_insert(visitor_periods)
+                .values(period=period, start=start, user_id=user_id)
+                .on_conflict_do_nothing()
+            )
+            if result.rowcount:
+                _adjust(connection, period, start, 1)
+
+    @staticmethod
+    def forget(connection, user_id, when):
+        for period in PERIODS:
+            start = VisitorService.period_start(period, when)
+            if _visited(connection, user_id, start, _period_end(period, start)):
+                continue
+
+            result = connection.execute(
+                delete(visitor_periods).where(
+                    visitor_periods.c.period == period,
+                    visitor_periods.c.start == start,
+                    visitor_periods.c.user_id == user_id,
+                )
+            )
+            if result.rowcount:
+                _adjust(connection, period, start, -1)
+
+    @staticmethod
+    def forget_user(connection, user_id):
+        visited = select(visitor_periods.c.period, visitor_periods.c.start).where(
+            visitor_periods.c.user_id == user_id
+        )
+        connection.execute(
+            update(visitor_counts)
+            .where(tuple_(visitor_counts.c.period, visitor_counts.c.start).in_(visited))
+            .values(visitors=visitor_counts.c.visitors - 1)
+        )
+        return connection.execute(
+            delete(visitor_periods).where(visitor_periods.c.user_id == user_id)
+        ).rowcount
+
+    @staticmethod
+    def current(period):
+        try:
+            start = VisitorService.period_start(period, datetime.now(timezone.utc))
+            value = db.session.execute(
+                select(visitor_counts.c.visitors).where(
+                    visitor_counts.c.period == period, visitor_counts.c.start == start
+                )
+            ).scalar()
+            return value or 0
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in current visitors '{period}': {str(e)}")
+            return 0
+
+    @staticmethod
+    def trend(period, limit):
+        try:
+            starts = [VisitorService.period_start(period, datetime.now(timezone.utc))]
+            while len(starts) < min(max(limit, 1), MAX_TREND_PERIODS):
+                starts.append(_previous_start(period, starts[-1]))
+
+            counts = dict(
+                db.session.execute(
+                    select(visitor_counts.c.start, visitor_counts.c.visitors).where(
+                        visitor_counts.c.period == period, visitor_counts.c.start >= starts[-1]
+                    )
+                ).all()
+            )
+            return [
+                {"start": start.isoformat(), "visitors": counts.get(start, 0)}
+                for start in reversed(starts)
+            ]
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in visitor trend '{period}': {str(e)}")
+            return None
+
+    @staticmethod
+    def rebuild(connection):
+        visits = select(LoginLogs.user_id, func.date(LoginLogs.login_time).label("day"))
+        if inspect(connection).has_table(LoginDaily.__tablename__):
+            visits = union(visits, select(LoginDaily.user_id, LoginDaily.day))
+        visits = visits.subquery()
+
+        connection.execute(delete(visitor_periods))
+        connection.execute(delete(visitor_counts))
+
+        for period, start in (
+            (DAY, visits.c.day),
+            (WEEK, func.date(visits.c.day, "weekday 0", "-6 days")),
+            (MONTH, func.date(visits.c.day, "start of month")),
+        ):
+            connection.execute(
+                insert(visitor_periods).from_select(
+                    ["period", "start", "user_id"],
+                    select(literal(period, String), start, visits.c.user_id).distinct(),
+                )
+            )
+
+        connection.execute(
+            insert(visitor_counts).from_select(
+                ["period", "start", "visitors"],
+                select(visitor_periods.c.period, visitor_periods.c.start, func.count())
+                .group_by(visitor_periods.c.period, visitor_periods.c.start),
+            )
+        )
+
+
+def _adjust(connection, period, start, delta):
+    result = connection.execute(
+        update(visitor_counts)
+        .where(visitor_counts.c.period == period, visitor_counts.c.start == start)
+        .values(visitors=visitor_counts.c.visitors + delta)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(visitor_counts).values(period=period, start=start, visitors=max(delta, 0))
+        )
+
+
+def _period_end(period, start):
+    if period == WEEK:
+        return start + timedelta(days=7)
+    if period == MONTH:
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _previous_start(period, start):
+    if period == WEEK:
+        return start - timedelta(days=7)
+    if period == MONTH:
+        return (start - timedelta(days=1)).replace(day=1)
+    return start - timedelta(days=1)
+
+
+def _visited(connection, user_id, start, end):
+    logged = exists().where(
+        LoginLogs.user_id == user_id,
+        LoginLogs.login_time >= datetime.combine(start, time.min),
+        LoginLogs.login_time < datetime.combine(end, time.min),
+    )
+    rolled_up = exists().where(
+        LoginDaily.user_id == user_id, LoginDaily.day >= start, LoginDaily.day < end
+    )
+    return connection.execute(select(logged | rolled_up)).scalar()
+
+
+@event.listens_for(LoginLogs, "after_insert")
+def _login_inserted(mapper, connection, target):
+    # Rows that fall back to the column default carry a SQL expression, not a value.
+    when = target.login_time
+    if not isinstance(when, datetime):
+        when = datetime.now(timezone.utc)
+    VisitorService.record(connection, target.user_id, when)
+
+
+@event.listens_for(LoginLogs, "after_delete")
+def _login_deleted(mapper, connection, target):
+    VisitorService.forget(connection, target.user_id, target.login_time)
@@ -1,11 +1,13 @@
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 import jwt
 import datetime
 from functools import wraps
-from bcrypt import hashpw, gensalt, checkpw
 from app.models.user import User
 from app.database.database import db
 from app.utils.logging_config import logger
+from app.utils.password_hasher import PasswordHasherBusy, password_hasher
+from app.utils.principal_cache import Principal, principal_cache, principal_from_user
+from app.utils.token_epochs import token_epochs
 from config import Config
 
 
@@ -27,10 +29,26 @@ def token_required(f):
             decoded_token = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
             username = decoded_token["username"]
 
-            current_user = User.query.filter_by(username=username).first()
+            if "user_id" in decoded_token:
+                user_id = decoded_token["user_id"]
 
-            if not current_user:
-                return jsonify({"message": "User not found!"}), 404
+                if not token_epochs.is_valid(user_id, decoded_token.get("epoch", 0)):
+                    return jsonify({"message": "Token has been revoked!"}), 401
+
+                current_user = Principal(
+                    user_id=user_id, username=username, role=decoded_token["role"]
+                )
+            else:
+                current_user = principal_cache.get(username)
+
+            if current_user is None:
+                user = User.query.filter_by(username=username).first()
+
+                if not user:
+                    return jsonify({"message": "User not found!"}), 404
+
+                current_user = principal_from_user(user)
+                principal_cache.set(username, current_user)
 
         except jwt.ExpiredSignatureError:
             return jsonify({"message": "Token has expired!"}), 401
@@ -42,14 +60,23 @@ def token_required(f):
     return decorated_function
 
 
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(current_user, *args, **kwargs):
+        if current_user.role != "admin":
+            return jsonify({"message": "Admin access required!"}), 403
+
+        return f(current_user, *args, **kwargs)
+
+    return decorated_function
+
+
 def hash_password(password):
-    salt = gensalt()
-    hashed_password = hashpw(password.encode(), salt)
-    return hashed_password.decode("utf-8")
+    return password_hasher.hash(password)
 
 
 def verify_password(password, hashed_password):
-    return checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return password_hasher.verify(password, hashed_password)
 
 
 def is_password_plaintext(password):
@@ -68,10 +95,13 @@ def update_password(username, hashed_password):
         logger.error(f"Error in update_password: {e}")
 
 
-def generate_token(username):
+def generate_token(user):
     expiration = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
     payload = {
-        "username": username,
+        "user_id": user.user_id,
+        "username": user.username,
+        "role": user.role,
+        "epoch": token_epochs.current(user.user_id),
         "exp": expiration,
     }
     token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
@@ -87,20 +117,30 @@ def authenticate(username, password):
             logger.warning(f"User '{username}' not found")
             return False, None, None, None
 
+        if user.locked:
+            logger.warning(f"User '{username}' is locked")
+            return False, None, None, None
+
         if user:
             stored_password = user.password
-            if is_password_plaintext(stored_password):
+            check_plaintext = current_app.config.get("PLAINTEXT_PASSWORD_CHECK", True)
+            if check_plaintext and is_password_plaintext(stored_password):
                 hashed_password = hash_password(stored_password)
                 update_password(username, hashed_password)
                 stored_password = hashed_password
 
             if verify_password(password, stored_password):
+                if password_hasher.needs_rehash(stored_password):
+                    update_password(username, hash_password(password))
+
                 role = user.role
-                access_token = generate_token(username)
+                access_token = generate_token(user)
                 return True, access_token, role, username
 
             logger.warning(f"Incorrect password for user '{username}'")
             return False, None, None, None
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         logger.error(f"Error in authenticate: {e}")
         return False, None, None, None
@@ -1,6 +1,8 @@
 RETRIEVAL_SUCCESS = "Retrieved successfully."
 ADD_SUCCESS = "Added successfully."
 DELETE_SUCCESS = "Deleted successfully."
+DELETE_SCHEDULED = "Deletion scheduled."
+DELETE_IN_PROGRESS = "Deletion already in progress."
 UPDATE_SUCCESS = "Updated successfully."
 ERROR_VIN_EXISTS = "Error: Vin number exists."
 ERROR_USERNAME_EXISTS = "Error: Username exists."
@@ -16,4 +18,16 @@ ERROR_NO_LOGS_LOGIN_FOUND = "Error: No Logs Login Found."
 ERROR_PLEASE_LOG_IN = "Error: Please log in."
 ERROR_USERNAME_NOT_FOUND = "Username not found."
 ERROR_FETCHING_DATA = "Error: fetching data."
+ERROR_INVALID_CURSOR = "Error: Invalid cursor."
+ERROR_INVALID_COUNT_MODE = "Error: Invalid count mode."
+ERROR_INVALID_IMPORT_FORMAT = "Error: Unsupported import format."
+ERROR_INVALID_IMPORT_ENCODING = "Error: Row is not valid UTF-8."
+ERROR_INVALID_EXPORT = "Error: Unsupported export type or format."
+ERROR_EXPORT_INCOMPLETE = "Error: Export stopped early, the rows above are incomplete."
+ERROR_INVALID_DATE = "Error: Invalid date, expected YYYY-MM-DD."
+ERROR_INVALID_ORDER = "Error: Invalid order, expected asc or desc."
+ERROR_INVALID_PERIOD = "Error: Invalid period, expected day, week or month."
+ERROR_SERVER_BUSY = "Error: Server is busy, please retry shortly."
+ERROR_TOO_MANY_ATTEMPTS = "Error: Too many failed login attempts, please retry later."
+ERROR_INVALID_BATCH = "Error: Expected a non-empty list of operations within the batch size limit."
 NO_CHANGES_MADE = "No changes made."
\ No newline at end of file
@@ -0,0 +1,107 @@
+import hashlib
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import inspect, select
+from app.models.table_version import TableVersion
+from app.utils.logging_config import logger
+from app.database.database import db
+
+
+# Versions are bumped by triggers in the database, so writes from CLI
+# commands and from other worker processes invalidate ETags as well.
+VERSIONED_TABLES = ("users", "cars", "services")
+
+versions_table = TableVersion.__table__
+
+
+class TableVersions:
+    def __init__(self):
+        self._available = {}
+
+    def enabled(self):
+        if not current_app.config.get("ETAG_ENABLED", True):
+            return False
+
+        engine = db.engine
+        if engine not in self._available:
+            try:
+                self._available[engine] = engine.dialect.name == "sqlite" and inspect(
+                    engine
+                ).has_table(versions_table.name)
+            except Exception as e:
+                logger.error(f"Error checking table versions: {str(e)}")
+                return False
+
+        return self._available[engine]
+
+    def get_many(self, tables):
+        rows = db.session.execute(
+            select(versions_table.c.name, versions_table.c.version).where(
+                versions_table.c.name.in_(tables)
+            )
+        ).all()
+        versions = dict(rows)
+        return {table: versions.get(table, 0) for table in tables}
+
+    def stats(self):
+        try:
+            if not self.enabled():
+                return {}
+            return self.get_many(VERSIONED_TABLES)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error reading table versions: {str(e)}")
+            return {}
+
+    @staticmethod
+    def create_tables(connection):
+        versions_table.create(connection, checkfirst=True)
+
+        existing = set(
+            connection.execute(select(versions_table.c.name)).scalars()
+        )
+        for table in VERSIONED_TABLES:
+            if table not in existing:
+                connection.execute(versions_table.insert().values(name=table, version=0))
+
+            bump = f"UPDATE table_versions SET version = version + 1 WHERE name = '{table}';"
+            for suffix, operation in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+                connection.exec_driver_sql(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} "
+                    f"AFTER {operation} ON {table} BEGIN {bump} END"
+                )
+
+
+table_versions = TableVersions()
+
+
+def compute_etag(current_user, tables):
+    versions = table_versions.get_many(tables)
+    parts = [str(current_user.user_id), current_user.role, request.full_path]
+    parts.extend(f"{table}:{versions[table]}" for table in tables)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def conditional_get(*tables):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(current_user, *args, **kwargs):
+            if not table_versions.enabled():
+                return f(current_user, *args, **kwargs)
+
+            etag = compute_etag(current_user, tables)
+
+            if request.if_none_match.contains(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(f(current_user, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return decorated_function
+
+    return decorator
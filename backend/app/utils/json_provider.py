@@ -0,0 +1,64 @@
+import datetime
+import decimal
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    # Decimal stays a string, as with Flask's default provider, so 49.90 keeps its scale.
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+
+    @staticmethod
+    def default(value):
+        try:
+            return _default(value)
+        except TypeError:
+            return DefaultJSONProvider.default(value)
+
+
+class OrjsonProvider(JSONProvider):
+    # orjson encodes date and datetime natively as ISO 8601; Decimal goes through _default.
+    option = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype="application/json",
+        )
+
+
+JSON_PROVIDERS = {"orjson": OrjsonProvider, "stdlib": StdlibJSONProvider}
+
+
+def make_json_provider(app):
+    name = app.config.get("JSON_PROVIDER", "auto")
+
+    if name == "auto":
+        name = "orjson" if orjson else "stdlib"
+
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON provider: {name}")
+
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON_PROVIDER is 'orjson' but orjson is not installed.")
+
+    return JSON_PROVIDERS[name](app)
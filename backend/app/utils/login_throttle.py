@@ -0,0 +1,109 @@
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from config import Config
+
+
+class LoginThrottle:
+    def __init__(self, user_limit=5, ip_limit=20, window=300, max_size=10000):
+        self.rejected = 0
+        self.failures = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.configure(user_limit, ip_limit, window, max_size)
+
+    def configure(self, user_limit, ip_limit, window, max_size):
+        with self._lock:
+            self.user_limit = user_limit
+            self.ip_limit = ip_limit
+            self.window = window
+            self.max_size = max_size
+            self._entries.clear()
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get("LOGIN_THROTTLE_USER_LIMIT", 5),
+            app.config.get("LOGIN_THROTTLE_IP_LIMIT", 20),
+            app.config.get("LOGIN_THROTTLE_WINDOW", 300),
+            app.config.get("LOGIN_THROTTLE_SIZE", 10000),
+        )
+
+    def try_acquire(self, username, ip_address):
+        # The check and the recorded attempt share one critical section, so
+        # concurrent requests cannot all pass the check before any is counted.
+        now = time.monotonic()
+        keys = ((("user", username), self.user_limit), (("ip", ip_address), self.ip_limit))
+
+        with self._lock:
+            wait = max(self._wait(key, limit, now) for key, limit in keys)
+            if wait:
+                self.rejected += 1
+                return max(1, math.ceil(wait)), None
+
+            self.failures += 1
+            for key, limit in keys:
+                attempts = self._entries.get(key)
+                if attempts is None:
+                    attempts = self._entries[key] = deque(maxlen=limit)
+                attempts.append(now)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+            return 0, now
+
+    def release(self, username, ip_address, attempt):
+        # Un-count an attempt that succeeded or was never checked.
+        with self._lock:
+            self.failures -= 1
+            for key in (("user", username), ("ip", ip_address)):
+                attempts = self._entries.get(key)
+                if attempts is None:
+                    continue
+                try:
+                    attempts.remove(attempt)
+                except ValueError:
+                    continue
+                if not attempts:
+                    del self._entries[key]
+
+    def reset(self, username):
+        with self._lock:
+            self._entries.pop(("user", username), None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "window": self.window,
+            }
+
+    def _wait(self, key, limit, now):
+        attempts = self._entries.get(key)
+        if attempts is None:
+            return 0
+
+        while attempts and attempts[0] <= now - self.window:
+            attempts.popleft()
+
+        if not attempts:
+            del self._entries[key]
+            return 0
+
+        if len(attempts) < limit:
+            return 0
+
+        return attempts[-limit] + self.window - now
+
+
+login_throttle = LoginThrottle(
+    user_limit=Config.LOGIN_THROTTLE_USER_LIMIT,
+    ip_limit=Config.LOGIN_THROTTLE_IP_LIMIT,
+    window=Config.LOGIN_THROTTLE_WINDOW,
+    max_size=Config.LOGIN_THROTTLE_SIZE,
+)
@@ -0,0 +1,218 @@
+import bisect
+import threading
+import time
+import weakref
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+BACKGROUND = "<background>"
+UNMATCHED = "<unmatched>"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def snapshot(self):
+        snapshot = Histogram(self.buckets)
+        snapshot.counts = list(self.counts)
+        snapshot.sum = self.sum
+        return snapshot
+
+
+class RequestMetrics:
+    def __init__(self, latency_buckets=LATENCY_BUCKETS, query_buckets=QUERY_BUCKETS):
+        self._lock = threading.Lock()
+        self._engines = weakref.WeakSet()
+        self.configure(latency_buckets, query_buckets)
+
+    def configure(self, latency_buckets, query_buckets):
+        with self._lock:
+            self.latency_buckets = tuple(sorted(latency_buckets))
+            self.query_buckets = tuple(sorted(query_buckets))
+            self.in_flight = 0
+            self._requests = {}
+            self._latency = {}
+            self._queries = {}
+            self._sql = {}
+
+    def init_app(self, app, engine):
+        self.configure(
+            app.config.get("METRICS_LATENCY_BUCKETS", LATENCY_BUCKETS),
+            app.config.get("METRICS_QUERY_BUCKETS", QUERY_BUCKETS),
+        )
+
+        if not app.config.get("METRICS_ENABLED", True):
+            return
+
+        app.before_request(self._start_request)
+        app.after_request(self._record_status)
+        app.teardown_request(self._finish_request)
+
+        if engine not in self._engines:
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+            self._engines.add(engine)
+
+    def _start_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_query_time = 0.0
+        with self._lock:
+            self.in_flight += 1
+
+    def _record_status(self, response):
+        g.metrics_status = response.status_code
+        return response
+
+    def _finish_request(self, error=None):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return
+
+        elapsed = time.perf_counter() - start
+        status = g.pop("metrics_status", 500)
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED
+        method = request.method
+        queries = g.pop("metrics_queries", 0)
+        query_time = g.pop("metrics_query_time", 0.0)
+
+        with self._lock:
+            self.in_flight -= 1
+
+            key = (method, route, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            latency = self._latency.get((method, route))
+            if latency is None:
+                latency = self._latency[(method, route)] = Histogram(self.latency_buckets)
+            latency.observe(elapsed)
+
+            per_request = self._queries.get((method, route))
+            if per_request is None:
+                per_request = self._queries[(method, route)] = Histogram(self.query_buckets)
+            per_request.observe(queries)
+
+            self._add_sql(route, queries, query_time)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+
+        if has_request_context() and "metrics_start" in g:
+            g.metrics_queries += 1
+            g.metrics_query_time += elapsed
+            return
+
+        with self._lock:
+            self._add_sql(BACKGROUND, 1, elapsed)
+
+    def _add_sql(self, route, queries, query_time):
+        count, seconds = self._sql.get(route, (0, 0.0))
+        self._sql[route] = (count + queries, seconds + query_time)
+
+    def render(self, components=None):
+        with self._lock:
+            in_flight = self.in_flight
+            requests = dict(self._requests)
+            latency = {key: value.snapshot() for key, value in self._latency.items()}
+            queries = {key: value.snapshot() for key, value in self._queries.items()}
+            sql = dict(self._sql)
+
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP http_requests_total Requests served, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(requests.items()):
+            lines.append(
+                f"http_requests_total{_labels(method=method, route=route, status=status)} {value}"
+            )
+
+        _histogram_lines(
+            lines, "http_request_duration_seconds", "Request latency in seconds.", latency
+        )
+        _histogram_lines(
+            lines, "http_request_sql_queries", "SQL statements executed per request.", queries
+        )
+
+        lines.append("# HELP sql_queries_total SQL statements executed, by route.")
+        lines.append("# TYPE sql_queries_total counter")
+        for route, (count, _) in sorted(sql.items()):
+            lines.append(f"sql_queries_total{_labels(route=route)} {count}")
+
+        lines.append("# HELP sql_query_seconds_total Time spent executing SQL, by route.")
+        lines.append("# TYPE sql_query_seconds_total counter")
+        for route, (_, seconds) in sorted(sql.items()):
+            lines.append(f"sql_query_seconds_total{_labels(route=route)} {seconds:.6f}")
+
+        for name, stats in (components or {}).items():
+            _stats_lines(lines, name, stats)
+
+        return "\n".join(lines) + "\n"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(lines, name, help_text, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+
+    for (method, route), histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+            cumulative += count
+            labels = _labels(method=method, route=route, le=bound)
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _labels(method=method, route=route)
+        lines.append(f"{name}_sum{labels} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+
+
+def _stats_lines(lines, name, stats):
+    # Component stats are flattened into gauges; nested dicts become one labelled series.
+    for key, value in sorted(stats.items()):
+        metric = f"app_{name}_{key}"
+        if isinstance(value, dict):
+            values = [(label, v) for label, v in sorted(value.items()) if _is_number(v)]
+            if values:
+                lines.append(f"# TYPE {metric} gauge")
+                lines.extend(f"{metric}{_labels(key=label)} {_format(v)}" for label, v in values)
+        elif _is_number(value):
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {_format(value)}")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float))
+
+
+def _format(value):
+    return str(int(value)) if isinstance(value, int) else repr(float(value))
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,185 @@
+import base64
+import datetime
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.sql import and_, or_
+
+
+COUNT_MODES = ("exact", "window", "estimate", "none")
+
+KeysetPage = namedtuple("KeysetPage", ["items", "next_cursor", "per_page"])
+Page = namedtuple("Page", ["items", "total", "pages", "page", "per_page", "has_next"])
+
+class InvalidCursor(ValueError):
+    pass
+
+
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def encode_cursor(values):
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime.date) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, columns=None):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+
+    if not isinstance(values, list):
+        return None
+
+    if columns is None:
+        return values
+
+    if len(values) != len(columns):
+        return None
+
+    try:
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        return None
+
+
+def _coerce(column, value):
+    python_type = column.type.python_type
+
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+
+    return python_type(value)
+
+
+def seek_condition(columns, values, descending=False):
+    conditions = []
+    for i, column in enumerate(columns):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*equal_prefix, beyond))
+
+    return or_(*conditions)
+
+
+def keyset_paginate(query, columns, cursor, per_page, key, descending=False):
+    per_page = max(per_page, 1)
+    query = query.order_by(*(column.desc() if descending else column for column in columns))
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if values is None:
+            raise InvalidCursor("Invalid cursor.")
+        query = query.filter(seek_condition(columns, values, descending))
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = encode_cursor(key(items[-1])) if len(rows) > per_page else None
+
+    return KeysetPage(items=items, next_cursor=next_cursor, per_page=per_page)
+
+
+def paginate_query(query, page, per_page, count="exact"):
+    page = max(page, 1)
+    per_page = max(per_page, 1)
+    offset = (page - 1) * per_page
+
+    if count == "window":
+        return _paginate_window(query, page, per_page, offset)
+
+    if count == "none":
+        rows = query.limit(per_page + 1).offset(offset).all()
+        return Page(
+            items=rows[:per_page],
+            total=None,
+            pages=None,
+            page=page,
+            per_page=per_page,
+            has_next=len(rows) > per_page,
+        )
+
+    items = query.limit(per_page).offset(offset).all()
+
+    if count == "estimate":
+        total = _cached_count(query)
+    else:
+        total = query.order_by(None).count()
+
+    return _page(items, total, page, per_page)
+
+
+def _paginate_window(query, page, per_page, offset):
+    names = [description["name"] for description in query.column_descriptions]
+    rows = (
+        query.add_columns(func.count().over().label("total_count"))
+        .limit(per_page)
+        .offset(offset)
+        .all()
+    )
+
+    if rows:
+        total = rows[0][-1]
+    elif page > 1:
+        # A page past the end carries no window total, so count separately.
+        total = query.order_by(None).count()
+    else:
+        total = 0
+
+    if len(names) == 1:
+        items = [row[0] for row in rows]
+    else:
+        # Drop the count column but keep attribute access and _asdict() for
+        # column-projected queries.
+        window_row = namedtuple("WindowRow", names, rename=True)
+        items = [window_row._make(tuple(row)[:-1]) for row in rows]
+
+    return _page(items, total, page, per_page)
+
+
+def _cached_count(query):
+    count_query = query.order_by(None)
+    compiled = count_query.statement.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    now = time.monotonic()
+
+    with _count_cache_lock:
+        entry = _count_cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+    total = count_query.count()
+    ttl = current_app.config.get("COUNT_CACHE_TTL", 30)
+    max_size = current_app.config.get("COUNT_CACHE_SIZE", 1024)
+
+    with _count_cache_lock:
+        _count_cache[key] = (total, now + ttl)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > max_size:
+            _count_cache.popitem(last=False)
+
+    return total
+
+
+def _page(items, total, page, per_page):
+    pages = math.ceil(total / per_page) if total else 0
+
+    return Page(
+        items=items,
+        total=total,
+        pages=pages,
+        page=page,
+        per_page=per_page,
+        has_next=page < pages,
+    )
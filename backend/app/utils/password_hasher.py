@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bcrypt import checkpw, gensalt, hashpw
+from config import Config
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def _hash(password, rounds):
+    return hashpw(password.encode("utf-8"), gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _verify(password, hashed_password):
+    return checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+def derive_max_pending(max_pending, workers, queue_factor):
+    # Each worker gets a short queue so bursts wait for a hash instead of
+    # being shed while the pool is momentarily busy.
+    if max_pending > 0:
+        return max_pending
+    return max(workers * queue_factor, 1)
+
+
+class PasswordHasher:
+    def __init__(self, rounds=12, workers=2, max_pending=3):
+        self.rejected = 0
+        self._pending = 0
+        self._executor = None
+        self._lock = threading.Lock()
+        self.configure(rounds, workers, max_pending)
+
+    def configure(self, rounds, workers, max_pending):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get("BCRYPT_ROUNDS", 12),
+            app.config.get("BCRYPT_WORKERS", 2),
+            derive_max_pending(
+                app.config.get("BCRYPT_MAX_PENDING", 0),
+                app.config.get("BCRYPT_WORKERS", 2),
+                app.config.get("BCRYPT_QUEUE_FACTOR", 4),
+            ),
+        )
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, password, hashed_password):
+        return self._run(_verify, password, hashed_password)
+
+    def needs_rehash(self, hashed_password):
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "rejected": self.rejected,
+            }
+
+    def _run(self, work, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+
+        try:
+            return self._executor.submit(work, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+password_hasher = PasswordHasher(
+    rounds=Config.BCRYPT_ROUNDS,
+    workers=Config.BCRYPT_WORKERS,
+    max_pending=derive_max_pending(
+        Config.BCRYPT_MAX_PENDING, Config.BCRYPT_WORKERS, Config.BCRYPT_QUEUE_FACTOR
+    ),
+)
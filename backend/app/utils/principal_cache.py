@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from config import Config
+
+
+Principal = namedtuple("Principal", ["user_id", "username", "role"])
+
+
+class PrincipalCache:
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                principal, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return principal
+
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, principal):
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+            }
+
+
+def principal_from_user(user):
+    return Principal(user_id=user.user_id, username=user.username, role=user.role)
+
+
+principal_cache = PrincipalCache(
+    max_size=Config.PRINCIPAL_CACHE_SIZE, ttl=Config.PRINCIPAL_CACHE_TTL
+)
@@ -0,0 +1,101 @@
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from app.models.token_epoch import TokenEpoch
+from app.utils.logging_config import logger
+from app.database.database import db
+
+
+epochs_table = TokenEpoch.__table__
+
+
+class TokenEpochs:
+    # Bumps are stored in the token_epochs table so every worker sees them.
+    # Each process keeps a copy that is reloaded once it is older than ttl
+    # seconds, so a revocation is enforced everywhere within that bound.
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._epochs = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get("TOKEN_EPOCH_TTL", 5)
+        with self._lock:
+            self._epochs = {}
+            self._loaded_at = None
+
+        with app.app_context():
+            self.refresh()
+
+    def refresh(self):
+        try:
+            with db.engine.connect() as connection:
+                epochs = dict(
+                    connection.execute(select(epochs_table.c.user_id, epochs_table.c.epoch)).all()
+                )
+        except Exception as e:
+            logger.error(f"Error loading token epochs: {str(e)}")
+            epochs = None
+
+        with self._lock:
+            if epochs is not None:
+                # Keep local bumps that a concurrent reload may not have seen yet.
+                for user_id, epoch in self._epochs.items():
+                    epochs[user_id] = max(epoch, epochs.get(user_id, 0))
+                self._epochs = epochs
+            self._loaded_at = time.monotonic()
+
+    def current(self, user_id):
+        # Read through to the database so a token issued right after a bump
+        # in another worker carries the new epoch.
+        try:
+            with db.engine.connect() as connection:
+                stored = connection.execute(
+                    select(epochs_table.c.epoch).where(epochs_table.c.user_id == user_id)
+                ).scalar()
+        except Exception as e:
+            logger.error(f"Error reading token epoch: {str(e)}")
+            stored = None
+
+        with self._lock:
+            return max(stored or 0, self._epochs.get(user_id, 0))
+
+    def bump(self, user_id):
+        with db.engine.begin() as connection:
+            stored = connection.execute(
+                select(epochs_table.c.epoch).where(epochs_table.c.user_id == user_id)
+            ).scalar()
+            with self._lock:
+                epoch = max(
+                    int(time.time() * 1000),
+                    (stored or 0) + 1,
+                    self._epochs.get(user_id, 0) + 1,
+                )
+            connection.execute(
+                insert(epochs_table)
+                .values(user_id=user_id, epoch=epoch)
+                .on_conflict_do_update(index_elements=[epochs_table.c.user_id], set_={"epoch": epoch})
+            )
+
+        with self._lock:
+            self._epochs[user_id] = epoch
+        return epoch
+
+    def is_valid(self, user_id, epoch):
+        with self._lock:
+            stale = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+        if stale:
+            self.refresh()
+
+        with self._lock:
+            return epoch >= self._epochs.get(user_id, 0)
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._epochs), "ttl": self.ttl}
+
+
+token_epochs = TokenEpochs()
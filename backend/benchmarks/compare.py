@@ -0,0 +1,85 @@
+import json
+import click
+
+
+PERCENTILES = ("p50", "p95", "p99")
+
+
+def load(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def phases(report):
+    phases = dict(report["routes"])
+    for mix, result in report.get("mixes", {}).items():
+        for lane, stats in result["lanes"].items():
+            phases[f"mix {mix}: {lane}"] = stats
+    return phases
+
+
+def change(before, after):
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+@click.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("candidate", type=click.Path(exists=True, dir_okay=False))
+@click.option("--threshold", default=10.0, show_default=True, help="Percent slowdown that counts as a regression.")
+@click.option("--percentile", default="p95", show_default=True, type=click.Choice(PERCENTILES))
+def main(baseline, candidate, threshold, percentile):
+    """Compare two benchmark reports and exit non-zero when a route regressed."""
+    before, after = load(baseline), load(candidate)
+    click.echo(
+        f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}, "
+        f"scale {before['meta'].get('scale')} -> {after['meta'].get('scale')}"
+    )
+
+    before_phases, after_phases = phases(before), phases(after)
+    regressions = []
+    for route in sorted(set(before_phases) | set(after_phases)):
+        old, new = before_phases.get(route), after_phases.get(route)
+        if old is None or new is None:
+            click.echo(f"{route:55} {'only in ' + (baseline if new is None else candidate)}")
+            continue
+
+        old_ms, new_ms = old["latency_ms"][percentile], new["latency_ms"][percentile]
+        delta = change(old_ms, new_ms)
+        throughput = change(old["throughput_rps"], new["throughput_rps"])
+        flag = ""
+        if delta is not None and delta > threshold:
+            flag = "  REGRESSION"
+            regressions.append(route)
+        if new["errors"] > old["errors"]:
+            flag += f"  errors {old['errors']} -> {new['errors']}"
+            regressions.append(route)
+
+        click.echo(
+            f"{route:55} {percentile} {_ms(old_ms)} -> {_ms(new_ms)} ms "
+            f"({_percent(delta)}), rps {_percent(throughput)}{_memory(old, new)}{flag}"
+        )
+
+    if regressions:
+        raise click.ClickException(f"{len(set(regressions))} routes regressed.")
+
+
+def _percent(value):
+    return "n/a" if value is None else f"{value:+.1f}%"
+
+
+def _ms(value):
+    return f"{'n/a':>9}" if value is None else f"{value:9.2f}"
+
+
+def _memory(old, new):
+    old_rss = old.get("memory", {}).get("rss_mb")
+    new_rss = new.get("memory", {}).get("rss_mb")
+    if old_rss is None or new_rss is None:
+        return ""
+    return f", rss {old_rss:.1f} -> {new_rss:.1f} MB"
+
+
+if __name__ == "__main__":
+    main()
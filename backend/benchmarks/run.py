@@ -0,0 +1,383 @@
+import http.client
+import itertools
+import json
+import math
+import os
+import platform
+import re
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import click
+from waitress.server import create_server
+from app import create_app
+from app.database.database import db
+from config import ProductionConfig
+from benchmarks.scenarios import ADMIN, MIXES, SCENARIOS, USER, BenchContext, prepare_pools
+from benchmarks.seed import (
+    ADMIN_USERNAME,
+    PASSWORD,
+    USER_USERNAME,
+    parse_scale,
+    scale_sizes,
+    seed_database,
+    seeded_path,
+)
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+# The seeding app skips request instrumentation and writes audit rows inline.
+SEED_OVERRIDES = {"METRICS_ENABLED": False, "SLOW_QUERY_THRESHOLD_MS": 0, "AUDIT_WRITE_MODE": "sync"}
+
+
+def make_config(database_path, overrides):
+    attributes = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{database_path}", **overrides}
+    return type("BenchmarkConfig", (ProductionConfig,), attributes)
+
+
+def ensure_seeded(data_dir, services, seed, reseed):
+    path = seeded_path(data_dir, services, seed)
+    if os.path.exists(path) and not reseed:
+        return path
+
+    os.makedirs(data_dir, exist_ok=True)
+    partial = f"{path}.partial"
+    for stale in (path, partial, f"{partial}-wal", f"{partial}-shm"):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    click.echo(f"Seeding {services} services into {path}...", err=True)
+    started = time.perf_counter()
+    app = create_app(make_config(partial, SEED_OVERRIDES))
+    with app.app_context():
+        seed_database(services, seed)
+        db.session.remove()
+        db.engine.dispose()
+
+    os.replace(partial, path)
+    click.echo(f"Seeded in {time.perf_counter() - started:.1f}s.", err=True)
+    return path
+
+
+class Client:
+    def __init__(self, address):
+        self.address = address
+        self.connection = http.client.HTTPConnection(*address, timeout=120)
+
+    def send(self, method, path, body, headers):
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+            status = response.status
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection(*self.address, timeout=120)
+            payload, status = b"", None
+        return status, time.perf_counter() - started, payload
+
+    def close(self):
+        self.connection.close()
+
+
+def login(address, username):
+    client = Client(address)
+    body = json.dumps({"username": username, "password": PASSWORD}).encode("utf-8")
+    status, _, payload = client.send("POST", "/", body, {"Content-Type": "application/json"})
+    client.close()
+
+    if status != 200:
+        raise click.ClickException(f"Logging in as {username} failed with status {status}.")
+    return json.loads(payload)["access_token"]
+
+
+def warm_up(scenario, context, address, warmup):
+    client = Client(address)
+    for _ in range(warmup):
+        request = scenario.build(context)
+        if request is None:
+            break
+        client.send(*request)
+    client.close()
+
+
+def drive(scenario, context, address, issued, requests, stop):
+    client = Client(address)
+    samples = []
+    while not stop.is_set() and (requests is None or next(issued) < requests):
+        request = scenario.build(context)
+        if request is None:
+            break
+        status, elapsed, _ = client.send(*request)
+        samples.append((status, elapsed))
+    client.close()
+    return samples
+
+
+def run_scenario(scenario, context, address, concurrency, requests, warmup):
+    warm_up(scenario, context, address, warmup)
+
+    issued = itertools.count()
+    stop = threading.Event()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(drive, scenario, context, address, issued, requests, stop)
+            for _ in range(concurrency)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_mix(mix, app, context, address, concurrency, requests, warmup):
+    previous = {key: app.config.get(key) for key in mix.settings}
+    app.config.update(mix.settings)
+    try:
+        for lane in mix.lanes:
+            warm_up(lane.scenario, context, address, warmup)
+
+        stop = threading.Event()
+        futures = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency * len(mix.lanes)) as executor:
+            for lane in mix.lanes:
+                workers = max(1, round(concurrency * lane.share))
+                issued = itertools.count()
+                lane_requests = None if lane.background else max(1, round(requests * lane.share))
+                futures[lane] = [
+                    executor.submit(drive, lane.scenario, context, address, issued, lane_requests, stop)
+                    for _ in range(workers)
+                ]
+
+            for lane, lane_futures in futures.items():
+                if not lane.background:
+                    for future in lane_futures:
+                        future.result()
+            stop.set()
+            wall = time.perf_counter() - started
+
+            return {
+                "settings": mix.settings,
+                "lanes": {
+                    lane.label: {
+                        "background": lane.background,
+                        **summarize([sample for future in lane_futures for sample in future.result()], wall),
+                    }
+                    for lane, lane_futures in futures.items()
+                },
+            }
+    finally:
+        app.config.update(previous)
+
+
+def current_rss():
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def measure_memory(run):
+    # The server and the clients share this process, so both are counted.
+    before = current_rss()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    result = run()
+
+    after = current_rss()
+    memory = {
+        "rss_mb": _megabytes(after),
+        "rss_delta_mb": _megabytes(after - before) if after is not None and before is not None else None,
+    }
+    if tracemalloc.is_tracing():
+        memory["traced_peak_mb"] = _megabytes(tracemalloc.get_traced_memory()[1])
+    result["memory"] = memory
+    return result
+
+
+def _megabytes(value):
+    return round(value / (1024 * 1024), 2) if value is not None else None
+
+
+def percentile(ordered, rank):
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples, wall):
+    latencies = sorted(elapsed * 1000 for _, elapsed in samples)
+    statuses = Counter("error" if status is None else str(status) for status, _ in samples)
+    errors = sum(
+        count for status, count in statuses.items() if status == "error" or int(status) >= 400
+    )
+
+    def rounded(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "statuses": dict(sorted(statuses.items())),
+        "duration_s": round(wall, 3),
+        "throughput_rps": round(len(samples) / wall, 1) if wall else None,
+        "latency_ms": {
+            "mean": rounded(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": rounded(percentile(latencies, 50)),
+            "p95": rounded(percentile(latencies, 95)),
+            "p99": rounded(percentile(latencies, 99)),
+            "max": rounded(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values:
+        key, separator, raw = value.partition("=")
+        if not separator:
+            raise click.BadParameter(f"Expected KEY=VALUE, got {value!r}.", param_hint="--set")
+        try:
+            overrides[key] = json.loads(raw)
+        except ValueError:
+            overrides[key] = raw
+    return overrides
+
+
+@click.command()
+@click.option("--scale", default="10k", show_default=True, help="10k, 100k, 1m or a service count.")
+@click.option("--seed", default=42, show_default=True, help="Random seed for the data set.")
+@click.option("--data-dir", default=DATA_DIR, show_default=True, help="Where seeded databases are cached.")
+@click.option("--reseed", is_flag=True, help="Rebuild the cached database for this scale and seed.")
+@click.option("--concurrency", default=8, show_default=True, help="Concurrent client connections.")
+@click.option("--requests", "request_count", default=200, show_default=True, help="Requests per route.")
+@click.option("--warmup", default=10, show_default=True, help="Unrecorded requests per route.")
+@click.option("--per-page", default=10, show_default=True, help="per_page for list and search routes.")
+@click.option("--server-threads", default=None, type=int, help="Waitress threads, defaults to --concurrency.")
+@click.option("--route", "routes", multiple=True, help="Only run routes matching this regex (repeatable).")
+@click.option("--mix", "mixes", multiple=True, help="Only run mixed scenarios matching this regex (repeatable).")
+@click.option("--trace-memory", is_flag=True, help="Record the tracemalloc peak per phase (slows requests).")
+@click.option("--set", "settings", multiple=True, help="Override a config value, e.g. --set JSON_PROVIDER=stdlib.")
+@click.option("--list", "list_only", is_flag=True, help="List the benchmarked routes and exit.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the JSON report here instead of stdout.")
+def main(
+    scale, seed, data_dir, reseed, concurrency, request_count, warmup, per_page,
+    server_threads, routes, mixes, trace_memory, settings, list_only, output,
+):
+    """Benchmark every route and mixed workload against a seeded database and report JSON."""
+    # Naming only routes or only mixes skips the other kind.
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if (routes or not mixes) and (not routes or any(re.search(pattern, scenario.name) for pattern in routes))
+    ]
+    selected_mixes = [
+        mix for mix in MIXES
+        if (mixes or not routes) and (not mixes or any(re.search(pattern, mix.name) for pattern in mixes))
+    ]
+    if list_only:
+        for scenario in scenarios:
+            click.echo(scenario.name)
+        for mix in selected_mixes:
+            click.echo(f"mix: {mix.name}")
+        return
+
+    overrides = parse_overrides(settings)
+    services = parse_scale(scale)
+    sizes = scale_sizes(services)
+    seeded = ensure_seeded(data_dir, services, seed, reseed)
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    database_path = os.path.join(workdir, "bench.db")
+    shutil.copy(seeded, database_path)
+
+    threads = server_threads or concurrency
+    app = create_app(make_config(database_path, {"SERVER_THREADS": threads, **overrides}))
+    with app.app_context():
+        pools = prepare_pools(sizes, request_count + warmup)
+        db.session.remove()
+
+    server = create_server(app, host="127.0.0.1", port=0, threads=threads)
+    address = ("127.0.0.1", server.effective_port)
+    threading.Thread(target=server.run, name="bench-server", daemon=True).start()
+
+    context = BenchContext(pools, per_page, seed)
+    report = {}
+    mix_report = {}
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        context.tokens[ADMIN] = login(address, ADMIN_USERNAME)
+        context.tokens[USER] = login(address, USER_USERNAME)
+
+        for scenario in scenarios:
+            click.echo(f"{scenario.name}...", err=True)
+            report[scenario.name] = measure_memory(
+                lambda: run_scenario(scenario, context, address, concurrency, request_count, warmup)
+            )
+
+        for mix in selected_mixes:
+            click.echo(f"mix: {mix.name}...", err=True)
+            mix_report[mix.name] = measure_memory(
+                lambda: run_mix(mix, app, context, address, concurrency, request_count, warmup)
+            )
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        server.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "scale": services,
+            "sizes": sizes,
+            "seed": seed,
+            "concurrency": concurrency,
+            "server_threads": threads,
+            "requests": request_count,
+            "warmup": warmup,
+            "per_page": per_page,
+            "trace_memory": trace_memory,
+            "config": overrides,
+        },
+        "routes": report,
+        "mixes": mix_report,
+    }
+
+    text = json.dumps(result, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        click.echo(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+import itertools
+import json
+import random
+import threading
+from datetime import date, timedelta
+from sqlalchemy import func, insert, select
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.database.database import db
+from app.services.counter_service import CounterService
+from benchmarks.seed import ADMIN_USERNAME, PASSWORD, SERVICE_TYPES, USER_USERNAME
+
+
+ADMIN = "admin"
+USER = "user"
+
+
+class Scenario:
+    def __init__(self, method, path, role=None, body=None, pool=None, consume=False, raw=False):
+        self.method = method
+        self.path = path
+        self.role = role
+        self.body = body
+        self.pool = pool
+        self.consume = consume
+        self.raw = raw
+
+    @property
+    def name(self):
+        rule = self.path if isinstance(self.path, str) else self.path.rule
+        return f"{self.method} {rule.split('?')[0]}"
+
+    def build(self, context):
+        item = None
+        if self.pool is not None:
+            item = context.take(self.pool) if self.consume else context.pick(self.pool)
+            if item is None:
+                return None
+
+        path = self.path if isinstance(self.path, str) else self.path(context, item)
+        body = self.body(context, item) if self.body is not None else None
+        headers = {}
+
+        if body is not None:
+            if self.raw:
+                body = body.encode("utf-8")
+                headers["Content-Type"] = "application/x-ndjson"
+            else:
+                body = json.dumps(body).encode("utf-8")
+                headers["Content-Type"] = "application/json"
+
+        if self.role is not None:
+            headers["Authorization"] = f"Bearer {context.tokens[self.role]}"
+
+        return self.method, path, body, headers
+
+
+class Path:
+    def __init__(self, rule, build):
+        self.rule = rule
+        self._build = build
+
+    def __call__(self, context, item):
+        return self._build(context, item)
+
+
+class Lane:
+    def __init__(self, label, scenario, share, background=False):
+        self.label = label
+        self.scenario = scenario
+        self.share = share
+        self.background = background
+
+
+# Lanes run at the same time; background lanes keep going until the others finish.
+class Mix:
+    def __init__(self, name, lanes, settings=None):
+        self.name = name
+        self.lanes = lanes
+        self.settings = settings or {}
+
+
+class BenchContext:
+    def __init__(self, pools, per_page, seed):
+        self.pools = pools
+        self.per_page = per_page
+        self.tokens = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+
+    def pick(self, pool):
+        with self._lock:
+            items = self.pools.get(pool)
+            return self._rng.choice(items) if items else None
+
+    def take(self, pool):
+        with self._lock:
+            items = self.pools.get(pool)
+            return items.pop() if items else None
+
+    def unique(self):
+        return next(self._counter)
+
+    def random_date(self):
+        with self._lock:
+            return (date(2025, 1, 1) - timedelta(days=self._rng.randint(0, 3650))).isoformat()
+
+
+def prepare_pools(sizes, count):
+    admin_id = _user_id(ADMIN_USERNAME)
+    user_id = _user_id(USER_USERNAME)
+    other_id = _user_id("bench_user_2")
+
+    def add_cars(owner_id, prefix):
+        first = _next_id(Car.car_id)
+        db.session.execute(
+            insert(Car),
+            [
+                {"user_id": owner_id, "name": "Pool", "model": "Disposable", "year": 2020, "vin": f"{prefix}{i:010d}"}
+                for i in range(count)
+            ],
+        )
+        return list(range(first, first + count))
+
+    def add_services(car_id):
+        first = _next_id(Service.service_id)
+        db.session.execute(
+            insert(Service),
+            [
+                {
+                    "car_id": car_id,
+                    "mileage": 1000 + i,
+                    "service_type": "pool service",
+                    "service_date": date(2024, 6, 1),
+                    "cost": 10,
+                }
+                for i in range(count)
+            ],
+        )
+        return list(range(first, first + count))
+
+    # Reads and updates draw from seeded rows, which no scenario deletes.
+    user_cars = _ids(select(Car.car_id).where(Car.user_id == user_id).order_by(Car.car_id))
+    user_services = _ids(
+        select(Service.service_id).join(Car, Service.car_id == Car.car_id).where(Car.user_id == user_id)
+    )
+    other_cars = _ids(select(Car.car_id).where(Car.user_id == other_id).order_by(Car.car_id))
+
+    pools = {
+        "admin_delete_cars": add_cars(other_id, "POOLA"),
+        "user_delete_cars": add_cars(user_id, "POOLU"),
+        "admin_delete_services": add_services(other_cars[0]),
+        "user_delete_services": add_services(user_cars[0]),
+    }
+
+    first_user = _next_id(User.user_id)
+    db.session.execute(
+        insert(User),
+        [
+            {"username": f"pool_user_{i}", "email": f"pool{i}@bench.local", "password": "", "role": "user"}
+            for i in range(count)
+        ],
+    )
+    pools["admin_delete_users"] = list(range(first_user, first_user + count))
+
+    first_log = _next_id(LoginLogs.log_id)
+    db.session.execute(
+        insert(LoginLogs),
+        [{"user_id": other_id, "ip_address": "10.9.9.9"} for _ in range(count)],
+    )
+    pools["admin_delete_logs"] = list(range(first_log, first_log + count))
+    pools["prune_days"] = [(date(2024, 9, 1) + timedelta(days=i)).isoformat() for i in range(count)]
+    db.session.commit()
+    CounterService.reconcile()
+
+    pools["user_cars"] = user_cars
+    pools["user_services"] = user_services
+    pools["cars"] = list(range(1, sizes["cars"] + 1))
+    pools["services"] = list(range(1, sizes["services"] + 1))
+    pools["users"] = [i for i in range(1, sizes["users"] + 1) if i not in (admin_id, user_id)]
+    return pools
+
+
+def _user_id(username):
+    return db.session.execute(select(User.user_id).where(User.username == username)).scalar()
+
+
+def _next_id(column):
+    return (db.session.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _ids(statement):
+    return list(db.session.execute(statement).scalars())
+
+
+def _listing(path):
+    return Path(path, lambda context, item: f"{path}?page=1&per_page={context.per_page}")
+
+
+def _by_id(rule, prefix):
+    return Path(rule, lambda context, item: f"{prefix}/{item}")
+
+
+def _car_body(context, item):
+    return {"name": "Bench", "model": "Sedan", "year": 2021, "vin": f"BRUN{context.unique():013d}"}
+
+
+def _service_body(context, item):
+    return {
+        "mileage": 42_000,
+        "type": "oil change",
+        "date": context.random_date(),
+        "nextDate": "",
+        "cost": 89.5,
+        "notes": "Benchmark",
+    }
+
+
+def _import_body(car_id):
+    def build(context, item):
+        return "\n".join(
+            json.dumps(
+                {
+                    "car_id": car_id(context),
+                    "mileage": 1000 * i,
+                    "service_type": SERVICE_TYPES[i % len(SERVICE_TYPES)],
+                    "service_date": context.random_date(),
+                    "cost": 50,
+                }
+            )
+            for i in range(10)
+        )
+
+    return build
+
+
+def _batch_cars(owner):
+    def build(context, item):
+        operations = []
+        for _ in range(10):
+            operation = {"op": "add", **_car_body(context, item)}
+            if owner:
+                operation["user_id"] = context.pick("users")
+            operations.append(operation)
+        return {"operations": operations}
+
+    return build
+
+
+def _batch_services(pool):
+    def build(context, item):
+        return {
+            "operations": [
+                {"op": "add", "car_id": context.pick(pool), **_service_body(context, item)}
+                for _ in range(10)
+            ]
+        }
+
+    return build
+
+
+def _prune(context, item):
+    return f"/admin/logs_login?date_from={item}&date_to={item}"
+
+
+SCENARIOS = [
+    # Authentication: a login storm pays the full bcrypt cost on every request.
+    Scenario("POST", "/", body=lambda context, item: {"username": USER_USERNAME, "password": PASSWORD}),
+    Scenario("POST", "/logout", role=USER),
+    # Admin reads.
+    Scenario("GET", _listing("/admin/users"), role=ADMIN),
+    Scenario("GET", "/admin/users/list", role=ADMIN),
+    Scenario("GET", _by_id("/admin/user/<int:user_id>", "/admin/user"), role=ADMIN, pool="users"),
+    Scenario("GET", _listing("/admin/cars"), role=ADMIN),
+    Scenario("GET", "/admin/cars/list", role=ADMIN),
+    Scenario("GET", _by_id("/admin/car/<int:car_id>", "/admin/car"), role=ADMIN, pool="cars"),
+    Scenario("GET", _listing("/admin/services"), role=ADMIN),
+    Scenario("GET", _by_id("/admin/service/<int:service_id>", "/admin/service"), role=ADMIN, pool="services"),
+    Scenario("GET", _listing("/admin/logs_login"), role=ADMIN),
+    Scenario(
+        "GET",
+        Path("/admin/export/<string:kind>", lambda context, item: f"/admin/export/services?user_id={item}"),
+        role=ADMIN,
+        pool="users",
+    ),
+    Scenario("GET", "/admin/dashboard_home", role=ADMIN),
+    Scenario("GET", "/admin/visitors?period=day&limit=30", role=ADMIN),
+    Scenario(
+        "GET",
+        Path("/admin/search", lambda context, item: f"/admin/search?query=oil&per_page={context.per_page}"),
+        role=ADMIN,
+    ),
+    Scenario("GET", "/admin/cache_stats", role=ADMIN),
+    Scenario("GET", "/admin/metrics", role=ADMIN),
+    # User reads.
+    Scenario("GET", "/user/dashboard_home_user", role=USER),
+    Scenario("GET", "/user/profile", role=USER),
+    Scenario("GET", _listing("/user/cars"), role=USER),
+    Scenario("GET", "/user/cars/ids-and-names", role=USER),
+    Scenario("GET", _by_id("/user/car/<int:car_id>", "/user/car"), role=USER, pool="user_cars"),
+    Scenario("GET", _listing("/user/services"), role=USER),
+    Scenario("GET", _by_id("/user/service/<int:service_id>", "/user/service"), role=USER, pool="user_services"),
+    Scenario(
+        "GET",
+        Path("/user/search", lambda context, item: f"/user/search?query=oil&per_page={context.per_page}"),
+        role=USER,
+    ),
+    # Admin writes.
+    Scenario(
+        "POST",
+        "/admin/add_user",
+        role=ADMIN,
+        body=lambda context, item: {
+            "username": f"bench_new_{context.unique()}",
+            "email": f"new{context.unique()}@bench.local",
+            "password": PASSWORD,
+            "role": "user",
+        },
+    ),
+    Scenario(
+        "PUT",
+        _by_id("/admin/update_user/<int:user_id>", "/admin/update_user"),
+        role=ADMIN,
+        pool="users",
+        body=lambda context, item: {"email": f"updated{context.unique()}@bench.local"},
+    ),
+    Scenario(
+        "POST",
+        "/admin/add_car",
+        role=ADMIN,
+        body=lambda context, item: {"userID": context.pick("users"), **_car_body(context, item)},
+    ),
+    Scenario(
+        "PUT",
+        _by_id("/admin/update_car/<int:car_id>", "/admin/update_car"),
+        role=ADMIN,
+        pool="cars",
+        body=lambda context, item: {"model": f"Model {context.unique()}"},
+    ),
+    Scenario(
+        "POST",
+        "/admin/add_service",
+        role=ADMIN,
+        body=lambda context, item: {"carID": context.pick("cars"), **_service_body(context, item)},
+    ),
+    Scenario(
+        "PUT",
+        _by_id("/admin/update_service/<int:service_id>", "/admin/update_service"),
+        role=ADMIN,
+        pool="services",
+        body=lambda context, item: {**_service_body(context, item), "mileage": 50_000 + context.unique()},
+    ),
+    Scenario(
+        "POST",
+        "/admin/import_services?format=ndjson",
+        role=ADMIN,
+        body=_import_body(lambda context: context.pick("cars")),
+        raw=True,
+    ),
+    Scenario("POST", "/admin/batch_cars", role=ADMIN, body=_batch_cars(owner=True)),
+    Scenario("POST", "/admin/batch_services", role=ADMIN, body=_batch_services("cars")),
+    # User writes.
+    Scenario(
+        "PUT",
+        "/user/update_profile",
+        role=USER,
+        body=lambda context, item: {"username": USER_USERNAME, "email": f"me{context.unique()}@bench.local"},
+    ),
+    Scenario("POST", "/user/add_car", role=USER, body=_car_body),
+    Scenario(
+        "PUT",
+        _by_id("/user/update_car/<int:car_id>", "/user/update_car"),
+        role=USER,
+        pool="user_cars",
+        body=lambda context, item: {"model": f"Model {context.unique()}"},
+    ),
+    Scenario(
+        "POST",
+        "/user/add_service",
+        role=USER,
+        body=lambda context, item: {"car_id": context.pick("user_cars"), **_service_body(context, item)},
+    ),
+    Scenario(
+        "PUT",
+        _by_id("/user/update_service/<int:service_id>", "/user/update_service"),
+        role=USER,
+        pool="user_services",
+        body=lambda context, item: {**_service_body(context, item), "mileage": 50_000 + context.unique()},
+    ),
+    Scenario(
+        "POST",
+        "/user/import_services?format=ndjson",
+        role=USER,
+        body=_import_body(lambda context: context.pick("user_cars")),
+        raw=True,
+    ),
+    Scenario("POST", "/user/batch_cars", role=USER, body=_batch_cars(owner=False)),
+    Scenario("POST", "/user/batch_services", role=USER, body=_batch_services("user_cars")),
+    # Deletes run last and only consume rows created for them.
+    Scenario(
+        "DELETE",
+        _by_id("/admin/delete_service/<int:service_id>", "/admin/delete_service"),
+        role=ADMIN,
+        pool="admin_delete_services",
+        consume=True,
+    ),
+    Scenario(
+        "DELETE",
+        _by_id("/user/delete_service/<int:service_id>", "/user/delete_service"),
+        role=USER,
+        pool="user_delete_services",
+        consume=True,
+    ),
+    Scenario(
+        "DELETE",
+        _by_id("/admin/delete_log/<int:log_id>", "/admin/delete_log"),
+        role=ADMIN,
+        pool="admin_delete_logs",
+        consume=True,
+    ),
+    Scenario("DELETE", Path("/admin/logs_login", _prune), role=ADMIN, pool="prune_days", consume=True),
+    Scenario(
+        "DELETE",
+        _by_id("/admin/delete_car/<int:car_id>", "/admin/delete_car"),
+        role=ADMIN,
+        pool="admin_delete_cars",
+        consume=True,
+    ),
+    Scenario(
+        "DELETE",
+        _by_id("/user/delete_car/<int:car_id>", "/user/delete_car"),
+        role=USER,
+        pool="user_delete_cars",
+        consume=True,
+    ),
+    Scenario(
+        "DELETE",
+        _by_id("/admin/delete_user/<int:user_id>", "/admin/delete_user"),
+        role=ADMIN,
+        pool="admin_delete_users",
+        consume=True,
+    ),
+]
+
+
+def _route(name):
+    return next(scenario for scenario in SCENARIOS if scenario.name == name)
+
+
+def _search(path, query):
+    return Path(path, lambda context, item: f"{path}?query={query}&per_page={context.per_page}")
+
+
+def _search_lanes(settings):
+    return Mix(
+        f"search {settings['SEARCH_BACKEND']}",
+        [
+            Lane("admin word", Scenario("GET", _search("/admin/search", "oil"), role=ADMIN), 0.25),
+            Lane("admin substring", Scenario("GET", _search("/admin/search", "000123"), role=ADMIN), 0.25),
+            Lane("user word", Scenario("GET", _search("/user/search", "oil"), role=USER), 0.25),
+            Lane("user substring", Scenario("GET", _search("/user/search", "000123"), role=USER), 0.25),
+        ],
+        settings,
+    )
+
+
+MIXES = [
+    # Latency of ordinary reads while logins saturate the password hasher.
+    Mix(
+        "login storm",
+        [
+            Lane("POST /", _route("POST /"), 0.5, background=True),
+            Lane("GET /user/cars", _route("GET /user/cars"), 0.25),
+            Lane("GET /admin/dashboard_home", _route("GET /admin/dashboard_home"), 0.25),
+        ],
+    ),
+    # Readers and writers contend for the SQLite write lock and ETag versions.
+    Mix(
+        "mixed reads and writes",
+        [
+            Lane("GET /user/cars", _route("GET /user/cars"), 0.3),
+            Lane("GET /user/services", _route("GET /user/services"), 0.3),
+            Lane("POST /user/add_service", _route("POST /user/add_service"), 0.2),
+            Lane("PUT /user/update_service", _route("PUT /user/update_service/<int:service_id>"), 0.2),
+        ],
+    ),
+    _search_lanes({"SEARCH_BACKEND": "fts"}),
+    _search_lanes({"SEARCH_BACKEND": "like"}),
+]
@@ -0,0 +1,133 @@
+import os
+import random
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.models.login_logs import LoginLogs
+from app.database.database import db
+from app.services.counter_service import CounterService
+from app.utils.auth_utils import hash_password
+
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+ADMIN_USERNAME = "bench_admin"
+USER_USERNAME = "bench_user_1"
+PASSWORD = "bench-password"
+
+SERVICE_TYPES = (
+    "oil change",
+    "tire rotation",
+    "brake pads",
+    "battery replacement",
+    "coolant flush",
+    "transmission service",
+    "air filter",
+    "wheel alignment",
+    "spark plugs",
+    "inspection",
+)
+CAR_NAMES = ("Toyota", "Honda", "Ford", "Chevrolet", "Nissan", "BMW", "Audi", "Mazda", "Subaru", "Kia")
+CAR_MODELS = ("Sedan", "Coupe", "Hatchback", "SUV", "Pickup", "Wagon", "Van")
+
+CHUNK_SIZE = 10_000
+
+
+def parse_scale(scale):
+    if scale.lower() in SCALES:
+        return SCALES[scale.lower()]
+    return int(scale)
+
+
+def scale_sizes(services):
+    return {
+        "users": max(services // 100, 10),
+        "cars": max(services // 10, 20),
+        "services": services,
+        "login_logs": services // 2,
+    }
+
+
+def seed_database(services, seed):
+    rng = random.Random(seed)
+    sizes = scale_sizes(services)
+    password = hash_password(PASSWORD)
+    today = date(2025, 1, 1)
+
+    users = [{"username": ADMIN_USERNAME, "email": "admin@bench.local", "password": password, "role": "admin"}]
+    users.extend(
+        {
+            "username": f"bench_user_{i}",
+            "email": f"user{i}@bench.local",
+            "password": password,
+            "role": "user",
+        }
+        for i in range(1, sizes["users"])
+    )
+    _insert(User, users)
+
+    # User ids start at 1 for the admin, so owners are drawn from 2..users.
+    _insert(
+        Car,
+        (
+            {
+                "user_id": 2 + i % (sizes["users"] - 1),
+                "name": rng.choice(CAR_NAMES),
+                "model": rng.choice(CAR_MODELS),
+                "year": rng.randint(1995, 2025),
+                "vin": f"BENCH{i:012d}",
+            }
+            for i in range(sizes["cars"])
+        ),
+    )
+
+    def services_rows():
+        for i in range(sizes["services"]):
+            service_date = today - timedelta(days=rng.randint(0, 3650))
+            yield {
+                "car_id": 1 + i % sizes["cars"],
+                "mileage": rng.randint(1_000, 250_000),
+                "service_type": rng.choice(SERVICE_TYPES),
+                "service_date": service_date,
+                "next_service_date": service_date + timedelta(days=180) if rng.random() < 0.5 else None,
+                "cost": round(rng.uniform(20, 2_000), 2),
+                "notes": f"Benchmark note {i}" if rng.random() < 0.3 else None,
+            }
+
+    _insert(Service, services_rows())
+
+    start = datetime(2024, 9, 1)
+    _insert(
+        LoginLogs,
+        (
+            {
+                "user_id": rng.randint(1, sizes["users"]),
+                "login_time": start + timedelta(seconds=rng.randint(0, 120 * 86_400)),
+                "logout_time": None,
+                "ip_address": f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            }
+            for _ in range(sizes["login_logs"])
+        ),
+    )
+
+    # Core inserts skip the counter listeners, so rebuild the counters in one pass.
+    CounterService.reconcile()
+    return sizes
+
+
+def _insert(model, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            db.session.execute(insert(model), chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(insert(model), chunk)
+    db.session.commit()
+
+
+def seeded_path(data_dir, services, seed):
+    return os.path.join(data_dir, f"bench-{services}-{seed}.db")
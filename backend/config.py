@@ -16,6 +16,75 @@ class Config:
     FLASK_HOST = os.getenv("FLASK_HOST", "127.0.0.1")
     FLASK_PORT = int(os.getenv("FLASK_PORT", 5001))
     FLASK_DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+    SERVER_THREADS = int(os.getenv("SERVER_THREADS", 4))
+
+    # "auto" uses orjson when it is installed and falls back to the stdlib encoder.
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "auto").lower()
+
+    # "fts" searches the SQLite full-text index, "like" scans with LIKE.
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "fts").lower()
+
+    AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "True").lower() == "true"
+
+    SQLITE_PRAGMAS = {}
+    SQLITE_BUSY_RETRIES = int(os.getenv("SQLITE_BUSY_RETRIES", 5))
+    SQLITE_BUSY_BACKOFF = float(os.getenv("SQLITE_BUSY_BACKOFF", 0.05))
+
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 1024))
+    PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+    # Seconds before a worker reloads token revocations made by other workers.
+    TOKEN_EPOCH_TTL = float(os.getenv("TOKEN_EPOCH_TTL", 5))
+
+    # Disable once `flask users migrate-passwords` reports nothing remaining.
+    PLAINTEXT_PASSWORD_CHECK = os.getenv("PLAINTEXT_PASSWORD_CHECK", "True").lower() == "true"
+
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", 2))
+    # Hashes allowed in flight before logins get a 503; 0 derives it as
+    # BCRYPT_WORKERS * BCRYPT_QUEUE_FACTOR. Keep SERVER_THREADS above it, or a
+    # login storm holds every server thread and ordinary reads queue behind it.
+    BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", 0))
+    BCRYPT_QUEUE_FACTOR = int(os.getenv("BCRYPT_QUEUE_FACTOR", 4))
+
+    LOGIN_THROTTLE_USER_LIMIT = int(os.getenv("LOGIN_THROTTLE_USER_LIMIT", 5))
+    LOGIN_THROTTLE_IP_LIMIT = int(os.getenv("LOGIN_THROTTLE_IP_LIMIT", 20))
+    LOGIN_THROTTLE_WINDOW = int(os.getenv("LOGIN_THROTTLE_WINDOW", 300))
+    LOGIN_THROTTLE_SIZE = int(os.getenv("LOGIN_THROTTLE_SIZE", 10000))
+
+    COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", 1024))
+    COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", 30))
+
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+    IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 100))
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+    LOGIN_LOG_RETENTION_DAYS = int(os.getenv("LOGIN_LOG_RETENTION_DAYS", 90))
+    LOGIN_LOG_PRUNE_CHUNK_SIZE = int(os.getenv("LOGIN_LOG_PRUNE_CHUNK_SIZE", 1000))
+
+    # Accounts with more services and login logs than this are deleted by a
+    # chunked background purge instead of inside the request.
+    PURGE_INLINE_LIMIT = int(os.getenv("PURGE_INLINE_LIMIT", 5000))
+    PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", 1000))
+    BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", 500))
+
+    # Conditional GETs use per-table versions kept by database triggers.
+    ETAG_ENABLED = os.getenv("ETAG_ENABLED", "True").lower() == "true"
+
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+    # Statements slower than this are written with their query plan to a
+    # separate rotating log; 0 turns the slow query log off.
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 250))
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "True").lower() == "true"
+    SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", 5 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", 3))
+
+    # "async" queues login/logout events for a background writer,
+    # "sync" writes them inside the request (used by tests).
+    AUDIT_WRITE_MODE = os.getenv("AUDIT_WRITE_MODE", "async").lower()
+    AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 100))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 0.5))
 
 
 class DevelopmentConfig(Config):
@@ -30,3 +99,13 @@ class ProductionConfig(Config):
     FLASK_HOST = "0.0.0.0"
     FLASK_PORT = 8080
     FLASK_DEBUG = False
+
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -65536)),
+        "temp_store": "MEMORY",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+        "foreign_keys": "ON",
+    }
@@ -0,0 +1,103 @@
+import datetime
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.database.database import db
+from app.models.user import User
+from app.models.car import Car
+from app.models.service import Service
+from app.utils.auth_utils import hash_password
+from config import Config
+
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        AUDIT_WRITE_MODE = "sync"
+        BCRYPT_ROUNDS = 4
+        METRICS_ENABLED = False
+        SLOW_QUERY_THRESHOLD_MS = 0
+        # Keeps the periodic epoch reload out of per-request query counts.
+        TOKEN_EPOCH_TTL = 60
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        _seed()
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _seed():
+    password = hash_password(PASSWORD)
+    db.session.add(User(username="admin", email="admin@example.com", password=password, role="admin"))
+    owner = User(username="owner", email="owner@example.com", password=password, role="user")
+    db.session.add(owner)
+    db.session.flush()
+
+    for i in range(5):
+        car = Car(user_id=owner.user_id, name=f"car{i}", model="model", year=2000 + i, vin=f"VIN{i:014d}")
+        db.session.add(car)
+        db.session.flush()
+        for j in range(5):
+            db.session.add(
+                Service(
+                    car_id=car.car_id,
+                    mileage=1000 * j,
+                    service_type=f"oil change {j}",
+                    service_date=datetime.date(2024, 1, j + 1),
+                    cost=49.90,
+                )
+            )
+    db.session.commit()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _login(client, username):
+    response = client.post("/", json={"username": username, "password": PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def admin_headers(client):
+    return _login(client, "admin")
+
+
+@pytest.fixture
+def user_headers(client):
+    return _login(client, "owner")
+
+
+@pytest.fixture
+def count_queries(app):
+    @contextmanager
+    def counting():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
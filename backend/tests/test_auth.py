@@ -0,0 +1,58 @@
+from conftest import PASSWORD, _login
+
+
+def test_token_revoked_after_password_change(client, user_headers):
+    response = client.put("/user/update_profile", headers=user_headers, json={"password": "new-password"})
+    assert response.status_code == 200
+
+    response = client.get("/user/profile", headers=user_headers)
+    assert response.status_code == 401
+
+    response = client.post("/", json={"username": "owner", "password": "new-password"})
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+    assert client.get("/user/profile", headers=headers).status_code == 200
+
+
+def test_token_revoked_after_demotion(client, admin_headers):
+    response = client.post(
+        "/admin/add_user",
+        headers=admin_headers,
+        json={"username": "second", "email": "second@example.com", "password": PASSWORD, "role": "admin"},
+    )
+    assert response.status_code == 200, response.get_json()
+
+    second_headers = _login(client, "second")
+    assert client.get("/admin/cache_stats", headers=second_headers).status_code == 200
+
+    users = client.get("/admin/users/list", headers=admin_headers).get_json()
+    user_id = next(user["user_id"] for user in users if user["username"] == "second")
+    response = client.put(f"/admin/update_user/{user_id}", headers=admin_headers, json={"role": "user"})
+    assert response.status_code == 200
+
+    assert client.get("/admin/cache_stats", headers=second_headers).status_code == 401
+    assert client.get("/admin/cache_stats", headers=_login(client, "second")).status_code == 403
+
+
+def test_login_throttle_returns_retry_after(app, client):
+    limit = app.config["LOGIN_THROTTLE_USER_LIMIT"]
+
+    for _ in range(limit):
+        response = client.post("/", json={"username": "owner", "password": "wrong"})
+        assert response.status_code == 401
+
+    response = client.post("/", json={"username": "owner", "password": PASSWORD})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_login_throttle_resets_after_success(app, client):
+    limit = app.config["LOGIN_THROTTLE_USER_LIMIT"]
+
+    for _ in range(limit - 1):
+        assert client.post("/", json={"username": "owner", "password": "wrong"}).status_code == 401
+    _login(client, "owner")
+
+    for _ in range(limit - 1):
+        assert client.post("/", json={"username": "owner", "password": "wrong"}).status_code == 401
+    _login(client, "owner")
@@ -0,0 +1,90 @@
+import datetime
+from sqlalchemy import select
+from app.database.database import db
+from app.models.counter import Counter, UserCounter
+from app.services.counter_service import CounterService
+
+
+def _snapshot(app):
+    with app.app_context():
+        totals = dict(db.session.execute(select(Counter.name, Counter.value)).all())
+        per_user = {
+            row.user_id: (row.total_cars, row.total_services, row.total_logins)
+            for row in db.session.execute(select(UserCounter)).scalars()
+            if (row.total_cars, row.total_services, row.total_logins) != (0, 0, 0)
+        }
+        db.session.remove()
+    return totals, per_user
+
+
+def assert_counters_reconciled(app):
+    maintained = _snapshot(app)
+    with app.app_context():
+        assert CounterService.reconcile()
+        db.session.remove()
+    assert maintained == _snapshot(app)
+
+
+def test_counters_after_batch(app, client, user_headers):
+    response = client.post(
+        "/user/batch_cars",
+        headers=user_headers,
+        json={
+            "operations": [
+                {"op": "add", "name": "new", "model": "model", "year": 2020, "vin": "VIN99999999999999"},
+                {"op": "delete", "car_id": 2},
+                {"op": "delete", "car_id": 999},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["succeeded"] == 2
+
+    response = client.post(
+        "/user/batch_services",
+        headers=user_headers,
+        json={
+            "operations": [
+                {"op": "add", "car_id": 1, "type": "tyres", "date": "2024-03-01", "cost": 80},
+                {"op": "delete", "service_id": 1},
+                {"op": "add", "car_id": 1, "type": ["bad"], "date": "2024-03-01"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["succeeded"] == 2
+
+    assert_counters_reconciled(app)
+
+
+def test_counters_after_import(app, client, user_headers):
+    rows = [
+        b'{"car_id": 1, "service_type": "oil", "service_date": "2024-04-01", "cost": "10.50"}',
+        b'{"car_id": 1, "service_type": "\xff", "service_date": "2024-04-01"}',
+        b'{"car_id": 999, "service_type": "oil", "service_date": "2024-04-01"}',
+        b'{"car_id": 3, "service_type": "filter", "service_date": "2024-04-02"}',
+    ]
+    response = client.post(
+        "/user/import_services?format=ndjson", headers=user_headers, data=b"\n".join(rows) + b"\n"
+    )
+    assert response.status_code == 200
+    assert response.get_json()["inserted"] == 2
+
+    assert_counters_reconciled(app)
+
+
+def test_counters_after_purge(app, client, admin_headers, user_headers):
+    client.post("/logout", headers=user_headers)
+    today = datetime.date.today().isoformat()
+
+    assert client.delete("/admin/delete_car/1", headers=admin_headers).status_code == 200
+    assert_counters_reconciled(app)
+
+    response = client.delete(f"/admin/logs_login?date_from={today}&date_to={today}", headers=admin_headers)
+    assert response.status_code == 200
+    assert_counters_reconciled(app)
+
+    users = client.get("/admin/users/list", headers=admin_headers).get_json()
+    owner_id = next(user["user_id"] for user in users if user["username"] == "owner")
+    assert client.delete(f"/admin/delete_user/{owner_id}", headers=admin_headers).status_code == 200
+    assert_counters_reconciled(app)
@@ -0,0 +1,24 @@
+def test_unchanged_listing_returns_304(client, user_headers):
+    response = client.get("/user/cars", headers=user_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get("/user/cars", headers={**user_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.data == b""
+
+
+def test_write_changes_etag(client, user_headers):
+    etag = client.get("/user/services?car_id=1", headers=user_headers).headers["ETag"]
+
+    response = client.post(
+        "/user/add_service",
+        headers=user_headers,
+        json={"car_id": 1, "mileage": 6000, "type": "brakes", "date": "2024-02-01", "cost": "120.00"},
+    )
+    assert response.status_code == 200
+
+    response = client.get("/user/services?car_id=1", headers={**user_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+import pytest
+from app.models.service import Service
+from app.utils.constants import ERROR_EXPORT_INCOMPLETE
+
+
+@pytest.fixture
+def failing_export(app, monkeypatch):
+    app.config["EXPORT_CHUNK_SIZE"] = 5
+    to_dict = Service.to_dict
+    calls = []
+
+    def fail_after_first_chunk(self):
+        calls.append(self.service_id)
+        if len(calls) > 7:
+            raise RuntimeError("disk I/O error")
+        return to_dict(self)
+
+    monkeypatch.setattr(Service, "to_dict", fail_after_first_chunk)
+
+
+def test_ndjson_export_ends_with_error_record(client, admin_headers, failing_export):
+    response = client.get("/admin/export/services?format=ndjson", headers=admin_headers)
+    assert response.status_code == 200
+
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == 6
+    assert all("service_id" in row for row in rows[:-1])
+    assert rows[-1] == {"error": ERROR_EXPORT_INCOMPLETE}
+
+
+def test_csv_export_ends_with_error_row(client, admin_headers, failing_export):
+    response = client.get("/admin/export/services?format=csv", headers=admin_headers)
+    assert response.status_code == 200
+
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0][0] == "service_id"
+    assert len(rows) == 7
+    assert rows[-1] == ["#error", ERROR_EXPORT_INCOMPLETE]
+
+
+def test_complete_export_has_no_error_record(client, admin_headers):
+    response = client.get("/admin/export/services?format=ndjson", headers=admin_headers)
+
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == 25
+    assert all("error" not in row for row in rows)
@@ -0,0 +1,35 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "role, url",
+    [
+        ("admin", "/admin/users"),
+        ("admin", "/admin/cars"),
+        ("admin", "/admin/services"),
+        ("user", "/user/cars"),
+        ("user", "/user/services?car_id=1"),
+    ],
+)
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90LWpzb24", "eyJhIjoxfQ", "WyJ4Il0"])
+def test_invalid_cursor_returns_400(client, admin_headers, user_headers, role, url, cursor):
+    headers = admin_headers if role == "admin" else user_headers
+    separator = "&" if "?" in url else "?"
+
+    response = client.get(f"{url}{separator}cursor={cursor}", headers=headers)
+    assert response.status_code == 400
+
+
+def test_cursor_walks_every_row_once(client, user_headers):
+    seen = []
+    # An empty cursor starts keyset mode at the first row.
+    url = "/user/services?car_id=1&per_page=2&cursor="
+
+    while url:
+        body = client.get(url, headers=user_headers).get_json()
+        seen.extend(service["service_id"] for service in body["services"])
+        cursor = body.get("next_cursor")
+        url = f"/user/services?car_id=1&per_page=2&cursor={cursor}" if cursor else None
+
+    assert sorted(seen) == seen
+    assert len(seen) == len(set(seen)) == 5
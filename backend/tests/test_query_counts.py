@@ -0,0 +1,35 @@
+import pytest
+
+
+# Statements per request once the principal cache is warm. The count must
+# not grow with per_page; a lazy load per row would.
+LISTING_ENDPOINTS = [
+    ("admin", "/admin/users", 2),
+    ("admin", "/admin/users/list", 2),
+    ("admin", "/admin/cars", 2),
+    ("admin", "/admin/cars/list", 2),
+    ("admin", "/admin/services", 2),
+    ("admin", "/admin/logs_login", 2),
+    ("admin", "/admin/search?query=car", 6),
+    ("admin", "/admin/search?query=oil", 6),
+    ("user", "/user/cars", 3),
+    ("user", "/user/cars/ids-and-names", 1),
+    ("user", "/user/services?car_id=1", 3),
+    ("user", "/user/search?query=oil", 4),
+]
+
+
+@pytest.mark.parametrize("role, url, expected", LISTING_ENDPOINTS)
+def test_listing_query_count_is_fixed(client, admin_headers, user_headers, count_queries, role, url, expected):
+    headers = admin_headers if role == "admin" else user_headers
+    separator = "&" if "?" in url else "?"
+    client.get(url, headers=headers)
+
+    counts = []
+    for per_page in (1, 50):
+        with count_queries() as statements:
+            response = client.get(f"{url}{separator}per_page={per_page}", headers=headers)
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+    assert counts == [expected, expected]
@@ -0,0 +1,19 @@
+import pytest
+from app.database.database import db
+from app.database.query_plans import explain, hot_queries, is_full_scan
+
+
+@pytest.mark.parametrize("name", sorted(hot_queries()))
+def test_hot_query_uses_an_index(app, name):
+    with app.app_context(), db.engine.connect() as connection:
+        details = explain(connection, hot_queries()[name])
+
+    assert not is_full_scan(details), f"{name}: {'; '.join(details)}"
+
+
+def test_full_scan_is_detected(app):
+    with app.app_context(), db.engine.connect() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_cars_vin")
+        details = explain(connection, hot_queries()["car_by_vin"])
+
+    assert is_full_scan(details)